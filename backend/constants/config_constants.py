@@ -16,6 +16,10 @@ API_DESCRIPTION = 'Professional Analytics Platform - Demand, Forecast, Recommend
 # Cache
 DEFAULT_CACHE_TTL = 3600  # 1 hour
 DEFAULT_CACHE_MAX_SIZE_MB = 100
+RECOMMENDATION_CACHE_MAX_ENTRIES = 64  # (date, route, customer) frames kept in memory
+RECOMMENDATION_CACHE_TTL = 60  # seconds
+HTTP_RESPONSE_CACHE_MAX_ENTRIES = 256  # encoded (etag, body) pairs for versioned cached responses
+DEMAND_AGGREGATE_CACHE_MAX_ENTRIES = 512  # (route, day) item totals kept per data load
 
 # Pagination
 DEFAULT_PAGE_SIZE = 50
@@ -54,6 +58,7 @@ LOG_BACKUP_COUNT = 5
 # Request/Response
 REQUEST_TIMEOUT = 120  # seconds
 MAX_REQUEST_SIZE_MB = 10
+THREADPOOL_THREADS_PER_CPU = 2  # worker threads for blocking pandas/DB work in async routes
 
 # Security
 SESSION_MAX_AGE = 3600  # 1 hour
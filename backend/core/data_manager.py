@@ -3,9 +3,12 @@ Centralized data manager with dynamic paths
 Loads all data on startup and provides it to all services
 """
 
+import threading
+import numpy as np
 import pandas as pd
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, NamedTuple, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -15,12 +18,29 @@ from backend.config import (
     get_cache_file_path,
     get_data_file_path
 )
+from backend.constants.config_constants import DEMAND_AGGREGATE_CACHE_MAX_ENTRIES
 from backend.database import get_database_manager
 from backend.logging_config import get_logger
 from backend.exceptions import DatabaseException, DataNotLoadedException
 
 logger = get_logger(__name__)
 
+
+class _DemandIndex(NamedTuple):
+    """Merged demand frame, the lookup keys built from it and its aggregate memo, published as one unit"""
+    frame: pd.DataFrame
+    route_keys: pd.Series
+    days: np.ndarray
+    # LRU of per-item totals: (route, day) -> aggregated frame
+    aggregates: "OrderedDict[Tuple[str, np.datetime64], pd.DataFrame]"
+
+
+class _JourneyIndex(NamedTuple):
+    """Journey plan frame and its (route, day) -> row positions map, published as one unit"""
+    frame: pd.DataFrame
+    positions: Dict[Tuple[str, pd.Timestamp], np.ndarray]
+
+
 class DataManager:
     """
     Singleton data manager that loads all data on startup
@@ -41,6 +61,10 @@ class DataManager:
             self.customer_data = pd.DataFrame()
             self.journey_plan = pd.DataFrame()
             self.merged_demand = pd.DataFrame()
+            self._demand_index = self._build_demand_index(self.merged_demand)
+            self._journey_index = self._build_journey_index(self.journey_plan)
+            self._demand_aggregates_lock = threading.Lock()
+            self._filter_options = {'routes': [], 'dates': []}
             self.last_refresh = None
             self.is_loaded = False
             self._initialized = True
@@ -89,35 +113,46 @@ class DataManager:
 
             # 3. Merge demand data
             logger.info("3. Merging demand data...")
-            self.merged_demand = self._merge_demand_data(self.demand_data, recent_demand)
+            merged_demand = self._merge_demand_data(self.demand_data, recent_demand)
+            # Requests keep running during a refresh: publish the frame together with its
+            # lookup keys and a fresh aggregate memo in one assignment, so a lookup never pairs
+            # old keys with a new frame and late writes from old requests land in the old memo
+            self._demand_index = self._build_demand_index(merged_demand)
+            self.merged_demand = merged_demand
             result['data']['merged_demand_rows'] = len(self.merged_demand)
             logger.info(f"   ✓ Merged total: {len(self.merged_demand)} records")
 
             # 4. Load customer data
             logger.info("4. Loading customer data...")
-            self.customer_data = self._fetch_sql_data('customer_data')
-            if not self.customer_data.empty:
-                self.customer_data['TrxDate'] = pd.to_datetime(self.customer_data['TrxDate'])
-                result['data']['customer_rows'] = len(self.customer_data)
-                logger.info(f"   ✓ Loaded {len(self.customer_data)} customer records")
+            customer_data = self._fetch_sql_data('customer_data')
+            if not customer_data.empty:
+                customer_data['TrxDate'] = pd.to_datetime(customer_data['TrxDate'])
+                result['data']['customer_rows'] = len(customer_data)
+                logger.info(f"   ✓ Loaded {len(customer_data)} customer records")
             else:
                 result['errors'].append("Failed to load customer data")
+            # Published only once TrxDate is converted: per-day lookups compare it to Timestamps
+            self.customer_data = customer_data
 
             # 5. Load journey plan
             logger.info("5. Loading journey plan...")
-            self.journey_plan = self._fetch_sql_data('journey_plan')
-            if not self.journey_plan.empty:
-                self.journey_plan['JourneyDate'] = pd.to_datetime(self.journey_plan['JourneyDate'])
-                result['data']['journey_rows'] = len(self.journey_plan)
-                logger.info(f"   ✓ Loaded {len(self.journey_plan)} journey records")
+            journey_plan = self._fetch_sql_data('journey_plan')
+            if not journey_plan.empty:
+                journey_plan['JourneyDate'] = pd.to_datetime(journey_plan['JourneyDate'])
+                result['data']['journey_rows'] = len(journey_plan)
+                logger.info(f"   ✓ Loaded {len(journey_plan)} journey records")
             else:
                 result['errors'].append("Failed to load journey plan")
+            # Published with its row positions in one assignment, like the demand index
+            self._journey_index = self._build_journey_index(journey_plan)
+            self.journey_plan = journey_plan
 
             # Save to cache
             logger.info("6. Caching data to disk...")
             self._save_cache()
 
             # Set metadata
+            self._build_filter_options()
             self.last_refresh = datetime.now()
             self.is_loaded = True
 
@@ -212,6 +247,48 @@ class DataManager:
 
         return merged
 
+    @staticmethod
+    def _build_demand_index(merged_demand: pd.DataFrame) -> _DemandIndex:
+        """Precompute route/day lookup keys so per-request filters avoid re-casting columns"""
+        if merged_demand.empty:
+            return _DemandIndex(
+                merged_demand, pd.Series(dtype=str), np.array([], dtype='datetime64[D]'), OrderedDict()
+            )
+
+        return _DemandIndex(
+            merged_demand,
+            # Categorical: a route lookup compares small integer codes, not Python strings
+            merged_demand['RouteCode'].astype(str).astype('category'),
+            # Day-resolution array: request filters become a plain int64 compare
+            pd.to_datetime(merged_demand['TrxDate']).to_numpy(dtype='datetime64[D]'),
+            OrderedDict()
+        )
+
+    @staticmethod
+    def _build_journey_index(journey_plan: pd.DataFrame) -> _JourneyIndex:
+        """Map (route, day) -> journey plan row positions so route/day lookups are a dict hit"""
+        if journey_plan.empty:
+            return _JourneyIndex(journey_plan, {})
+
+        route_keys = journey_plan['RouteCode'].astype(str).str.strip()
+        day_keys = journey_plan['JourneyDate'].dt.normalize()
+        return _JourneyIndex(journey_plan, journey_plan.groupby([route_keys, day_keys], sort=False).indices)
+
+    def _build_filter_options(self):
+        """Precompute the route/date filter lists; they only change when data reloads"""
+        routes = []
+        if not self.merged_demand.empty:
+            routes = [{"code": str(route), "name": str(route)}
+                      for route in sorted(self.merged_demand['RouteCode'].unique().tolist())]
+
+        dates = []
+        if not self.journey_plan.empty:
+            journey_days = self.journey_plan['JourneyDate'].dropna().to_numpy(dtype='datetime64[D]')
+            # np.unique sorts, and datetime64[D] renders as YYYY-MM-DD
+            dates = np.unique(journey_days).astype(str).tolist()
+
+        self._filter_options = {'routes': routes, 'dates': dates}
+
     def _save_cache(self):
         """Save all data to cache files using dynamic paths"""
         try:
@@ -233,6 +310,87 @@ class DataManager:
             df = df[df['RouteCode'] == str(route_filter)]
         return df
 
+    def get_demand_for_route_date(self, route_code: str, date) -> pd.DataFrame:
+        """Get demand rows for a single route and day without copying the full dataset"""
+        # One read of the index: the frame and its keys always belong together
+        index = self._demand_index
+        if not self.is_loaded or index.frame.empty:
+            return pd.DataFrame()
+
+        return self._demand_rows(index, str(route_code), np.datetime64(pd.Timestamp(date), 'D'))
+
+    @staticmethod
+    def _demand_rows(index: _DemandIndex, route_key: str, day: np.datetime64) -> pd.DataFrame:
+        """Select one route/day of demand rows from an index snapshot"""
+        mask = (index.route_keys == route_key) & (index.days == day)
+        return index.frame[mask]
+
+    def get_demand_aggregated(self, route_code: str, date) -> pd.DataFrame:
+        """
+        Get per-item demand totals for a route and day. Demand is static between
+        refreshes, so recently used (route, day) totals are kept in a bounded LRU
+        and reused; treat the returned frame as read-only.
+        """
+        index = self._demand_index
+        if not self.is_loaded or index.frame.empty:
+            return pd.DataFrame()
+
+        key = (str(route_code), np.datetime64(pd.Timestamp(date), 'D'))
+        with self._demand_aggregates_lock:
+            aggregated = index.aggregates.get(key)
+            if aggregated is not None:
+                index.aggregates.move_to_end(key)
+                return aggregated
+
+        aggregated = self._aggregate_demand_by_item(self._demand_rows(index, *key))
+
+        # Keys come from requests: only remember (route, day) pairs that have demand,
+        # and keep the memo bounded
+        if not aggregated.empty:
+            with self._demand_aggregates_lock:
+                index.aggregates[key] = aggregated
+                index.aggregates.move_to_end(key)
+                while len(index.aggregates) > DEMAND_AGGREGATE_CACHE_MAX_ENTRIES:
+                    index.aggregates.popitem(last=False)
+        return aggregated
+
+    @staticmethod
+    def _aggregate_demand_by_item(demand_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aggregate demand rows per (ItemCode, ItemName): sum Predicted and TotalQuantity,
+        mean AvgUnitPrice. Sorts once and reduces contiguous runs with np.add.reduceat
+        instead of a hashed multi-key groupby.
+        """
+        ordered = demand_data.dropna(subset=['ItemCode', 'ItemName'])
+        if ordered.empty:
+            return pd.DataFrame(columns=['ItemCode', 'ItemName', 'Predicted', 'TotalQuantity', 'AvgUnitPrice'])
+        ordered = ordered.sort_values(['ItemCode', 'ItemName'], kind='stable')
+
+        codes = ordered['ItemCode'].to_numpy()
+        names = ordered['ItemName'].to_numpy()
+        run_start = np.ones(len(ordered), dtype=bool)
+        run_start[1:] = (codes[1:] != codes[:-1]) | (names[1:] != names[:-1])
+        starts = np.flatnonzero(run_start)
+
+        predicted = np.nan_to_num(ordered['Predicted'].to_numpy(dtype=np.float64))
+        quantity = np.nan_to_num(ordered['TotalQuantity'].to_numpy(dtype=np.float64))
+        price = ordered['AvgUnitPrice'].to_numpy(dtype=np.float64)
+        has_price = ~np.isnan(price)
+
+        # Mean ignores missing prices, like groupby's 'mean'
+        price_sum = np.add.reduceat(np.where(has_price, price, 0.0), starts)
+        price_count = np.add.reduceat(has_price.astype(np.int64), starts)
+
+        return pd.DataFrame({
+            'ItemCode': codes[starts],
+            'ItemName': names[starts],
+            'Predicted': np.add.reduceat(predicted, starts),
+            'TotalQuantity': np.add.reduceat(quantity, starts),
+            'AvgUnitPrice': np.divide(
+                price_sum, price_count, out=np.full_like(price_sum, np.nan), where=price_count > 0
+            )
+        })
+
     def get_customer_data(self, route_filter: Optional[int] = None) -> pd.DataFrame:
         """Get customer data, optionally filtered by route"""
         if not self.is_loaded:
@@ -244,6 +402,17 @@ class DataManager:
             df = df[df['RouteCode'] == str(route_filter)]
         return df
 
+    def get_customer_data_for_date(self, date) -> pd.DataFrame:
+        """Get customer sales rows for a single day, copying only that slice"""
+        if not self.is_loaded or self.customer_data.empty:
+            return pd.DataFrame()
+
+        # Half-open day range on the native datetime64 column (parsed once at load)
+        day_start = pd.Timestamp(date).normalize()
+        trx_date = self.customer_data['TrxDate']
+        mask = (trx_date >= day_start) & (trx_date < day_start + pd.Timedelta(days=1))
+        return self.customer_data[mask].copy()
+
     def get_journey_plan(self, route_filter: Optional[int] = None, date: Optional[str] = None) -> pd.DataFrame:
         """Get journey plan, optionally filtered"""
         if not self.is_loaded:
@@ -261,6 +430,22 @@ class DataManager:
 
         return df
 
+    def get_journey_for_route_date(self, route_code: str, date) -> pd.DataFrame:
+        """Get journey plan rows for a single route and day via the precomputed index"""
+        # One read of the index: positions are only valid for the frame they were built from
+        index = self._journey_index
+        if not self.is_loaded or index.frame.empty:
+            return pd.DataFrame()
+
+        positions = index.positions.get((str(route_code).strip(), pd.Timestamp(date).normalize()))
+        if positions is None:
+            return index.frame.iloc[0:0]
+        return index.frame.iloc[positions]
+
+    def get_filter_options(self) -> Dict[str, list]:
+        """Get supervision filter options (routes from demand, dates from journey plan)"""
+        return self._filter_options
+
     def get_summary(self) -> Dict[str, Any]:
         """Get data summary"""
         if not self.is_loaded:
@@ -2,6 +2,7 @@
 Dynamic Supervision Session Manager
 Handles real-time visit tracking and redistribution of unsold items
 """
+import threading
 import pandas as pd
 from typing import Dict, Any
 from datetime import datetime
@@ -289,18 +290,31 @@ class DynamicSupervisionSession:
 
 # Global session storage (in production, use Redis or database)
 active_sessions = {}
+_sessions_lock = threading.Lock()
 
 def get_or_create_session(route_code: str, date: str) -> DynamicSupervisionSession:
     """Get existing session or create new one"""
     session_key = f"{route_code}_{date}"
 
-    if session_key not in active_sessions:
-        active_sessions[session_key] = DynamicSupervisionSession(route_code, date)
+    with _sessions_lock:
+        session = active_sessions.get(session_key)
+        if session is None:
+            session = active_sessions[session_key] = DynamicSupervisionSession(route_code, date)
 
-    return active_sessions[session_key]
+    return session
+
+def reset_or_create_session(route_code: str, date: str) -> DynamicSupervisionSession:
+    """Replace any existing session with a fresh one in a single critical section"""
+    session_key = f"{route_code}_{date}"
+    session = DynamicSupervisionSession(route_code, date)
+
+    with _sessions_lock:
+        active_sessions[session_key] = session
+
+    return session
 
 def clear_session(route_code: str, date: str):
     """Clear a session"""
     session_key = f"{route_code}_{date}"
-    if session_key in active_sessions:
-        del active_sessions[session_key]
\ No newline at end of file
+    with _sessions_lock:
+        active_sessions.pop(session_key, None)
\ No newline at end of file
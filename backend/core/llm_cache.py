@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import Any, Dict, Optional, Callable
 from datetime import datetime, timedelta
 import threading
+from collections import OrderedDict
 from functools import wraps
 import logging
 
@@ -22,13 +23,14 @@ class LLMCache:
     Thread-safe, efficient, and production-ready
     """
 
-    def __init__(self, cache_dir: str = None, default_ttl_hours: int = 24):
+    def __init__(self, cache_dir: str = None, default_ttl_hours: int = 24, memory_max_entries: int = 256):
         """
         Initialize LLM cache
 
         Args:
             cache_dir: Directory to store cache files (default: backend/cache/llm)
             default_ttl_hours: Default time-to-live for cache entries in hours
+            memory_max_entries: Entries kept in the in-memory layer in front of the files
         """
         if cache_dir is None:
             cache_dir = Path(__file__).parent.parent / 'cache' / 'llm'
@@ -38,6 +40,10 @@ class LLMCache:
         self.default_ttl = timedelta(hours=default_ttl_hours)
         self._lock = threading.Lock()
 
+        # In-memory LRU in front of the files: cache_key -> (expires_at, estimated_cost, response)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._memory_max_entries = memory_max_entries
+
         # Stats
         self.hits = 0
         self.misses = 0
@@ -69,6 +75,16 @@ class LLMCache:
             Cached response dict or None if not found/expired
         """
         cache_key = self._generate_cache_key(prefix, **kwargs)
+
+        # Repeat clicks are served from memory without touching disk
+        entry = self._memory_get(cache_key)
+        if entry is not None:
+            estimated_cost, response = entry
+            self.hits += 1
+            self.total_cost_saved += estimated_cost
+            logger.info(f"Cache HIT (memory): {prefix} (saved ${estimated_cost:.4f})")
+            return response
+
         cache_path = self._get_cache_path(cache_key)
 
         if not cache_path.exists():
@@ -90,6 +106,7 @@ class LLMCache:
                 return None
 
             # Valid cache hit
+            self._memory_set(cache_key, expires_at, cache_data.get('estimated_cost', 0.001), cache_data['response'])
             self.hits += 1
             self.total_cost_saved += cache_data.get('estimated_cost', 0.001)
 
@@ -132,6 +149,8 @@ class LLMCache:
             'response': response
         }
 
+        self._memory_set(cache_key, expires_at, estimated_cost, response)
+
         try:
             with self._lock:
                 with open(cache_path, 'w', encoding='utf-8') as f:
@@ -142,12 +161,37 @@ class LLMCache:
         except Exception as e:
             logger.error(f"Cache write error for {cache_key}: {e}")
 
+    def _memory_get(self, cache_key: str) -> Optional[tuple]:
+        """Get (estimated_cost, response) from the in-memory layer if present and not expired"""
+        with self._lock:
+            entry = self._memory.get(cache_key)
+            if entry is None:
+                return None
+            expires_at, estimated_cost, response = entry
+            if datetime.now() >= expires_at:
+                del self._memory[cache_key]
+                return None
+            self._memory.move_to_end(cache_key)
+            return estimated_cost, response
+
+    def _memory_set(self, cache_key: str, expires_at: datetime, estimated_cost: float, response: Dict[str, Any]):
+        """Store response in the in-memory layer, evicting least recently used entries"""
+        with self._lock:
+            self._memory[cache_key] = (expires_at, estimated_cost, response)
+            self._memory.move_to_end(cache_key)
+            while len(self._memory) > self._memory_max_entries:
+                self._memory.popitem(last=False)
+
     def clear_expired(self):
         """Remove all expired cache entries"""
         try:
             now = datetime.now()
             removed = 0
 
+            with self._lock:
+                for cache_key in [k for k, entry in self._memory.items() if now >= entry[0]]:
+                    del self._memory[cache_key]
+
             for cache_file in self.cache_dir.glob("*.json"):
                 try:
                     with open(cache_file, 'r', encoding='utf-8') as f:
@@ -170,6 +214,9 @@ class LLMCache:
     def clear_all(self):
         """Clear entire cache"""
         try:
+            with self._lock:
+                self._memory.clear()
+
             removed = 0
             for cache_file in self.cache_dir.glob("*.json"):
                 cache_file.unlink()
@@ -332,17 +379,22 @@ def cached_llm_call(
 # Global instances
 _llm_cache = None
 _rate_limiter = None
+# Analysis endpoints run in a threadpool; guards first-use construction so
+# concurrent requests can't each build (and keep) their own cache or limiter
+_instances_lock = threading.Lock()
 
 
 def get_llm_cache() -> LLMCache:
     """Get global LLM cache instance with configuration from environment"""
     global _llm_cache
     if _llm_cache is None:
-        import os
-        from backend.constants.config_constants import DEFAULT_LLM_CACHE_TTL_HOURS
+        with _instances_lock:
+            if _llm_cache is None:
+                import os
+                from backend.constants.config_constants import DEFAULT_LLM_CACHE_TTL_HOURS
 
-        ttl_hours = int(os.getenv('LLM_CACHE_TTL_HOURS', DEFAULT_LLM_CACHE_TTL_HOURS))
-        _llm_cache = LLMCache(default_ttl_hours=ttl_hours)
+                ttl_hours = int(os.getenv('LLM_CACHE_TTL_HOURS', DEFAULT_LLM_CACHE_TTL_HOURS))
+                _llm_cache = LLMCache(default_ttl_hours=ttl_hours)
 
     return _llm_cache
 
@@ -351,14 +403,16 @@ def get_rate_limiter() -> RateLimiter:
     """Get global rate limiter instance with configuration from environment"""
     global _rate_limiter
     if _rate_limiter is None:
-        import os
-        from backend.constants.config_constants import (
-            DEFAULT_LLM_RATE_LIMIT_MAX_REQUESTS,
-            DEFAULT_LLM_RATE_LIMIT_TIME_WINDOW
-        )
-
-        max_requests = int(os.getenv('LLM_RATE_LIMIT_MAX_REQUESTS', DEFAULT_LLM_RATE_LIMIT_MAX_REQUESTS))
-        time_window = int(os.getenv('LLM_RATE_LIMIT_TIME_WINDOW_SECONDS', DEFAULT_LLM_RATE_LIMIT_TIME_WINDOW))
-        _rate_limiter = RateLimiter(max_requests=max_requests, time_window_seconds=time_window)
+        with _instances_lock:
+            if _rate_limiter is None:
+                import os
+                from backend.constants.config_constants import (
+                    DEFAULT_LLM_RATE_LIMIT_MAX_REQUESTS,
+                    DEFAULT_LLM_RATE_LIMIT_TIME_WINDOW
+                )
+
+                max_requests = int(os.getenv('LLM_RATE_LIMIT_MAX_REQUESTS', DEFAULT_LLM_RATE_LIMIT_MAX_REQUESTS))
+                time_window = int(os.getenv('LLM_RATE_LIMIT_TIME_WINDOW_SECONDS', DEFAULT_LLM_RATE_LIMIT_TIME_WINDOW))
+                _rate_limiter = RateLimiter(max_requests=max_requests, time_window_seconds=time_window)
 
     return _rate_limiter
@@ -3,12 +3,19 @@ Recommendation Storage Manager
 Handles saving and retrieving daily recommendations from YaumiAIML database
 """
 
+import threading
+import time
 import pandas as pd
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from backend.database import get_database_manager
 from backend.logging_config import get_logger
 from backend.exceptions import DatabaseException
+from backend.constants.config_constants import (
+    RECOMMENDATION_CACHE_MAX_ENTRIES,
+    RECOMMENDATION_CACHE_TTL
+)
 
 logger = get_logger(__name__)
 
@@ -16,10 +23,56 @@ logger = get_logger(__name__)
 class RecommendationStorage:
     """Manages storage and retrieval of daily recommendations in database"""
 
+    # Integer count columns narrowed after loading (values are small non-negative counts)
+    COMPACT_INT_COLUMNS = ['RecommendedQuantity', 'VanLoad', 'AvgQuantityPerVisit', 'DaysSinceLastPurchase']
+
     def __init__(self):
         self.db_manager = get_database_manager()
         self.table_name = "[YaumiAIML].[dbo].[tbl_staged_recommended_orders]"
 
+        # LRU cache of query results: key -> (stored_at, DataFrame)
+        self._cache: "OrderedDict[Tuple, Tuple[float, pd.DataFrame]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _cache_get(self, key: Tuple) -> Optional[pd.DataFrame]:
+        """Return a copy of a cached frame, or None if missing/expired"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            stored_at, df = entry
+            if time.monotonic() - stored_at > RECOMMENDATION_CACHE_TTL:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+        # Callers mutate the frame they get back, so never hand out the cached one
+        return df.copy()
+
+    def _cache_put(self, key: Tuple, df: pd.DataFrame) -> None:
+        """Store a copy of a frame, evicting the least recently used entry when full"""
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), df.copy())
+            self._cache.move_to_end(key)
+            while len(self._cache) > RECOMMENDATION_CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def invalidate_cache(self, date: str, route_code: Optional[str] = None) -> None:
+        """
+        Drop cached results for a date (and route, if given)
+
+        Args:
+            date: Target date (YYYY-MM-DD)
+            route_code: Optional route; all-route entries for the date are always dropped
+        """
+        route = str(route_code) if route_code else None
+        with self._cache_lock:
+            stale = [
+                key for key in self._cache
+                if key[0] == date and (route is None or key[1] is None or key[1] == route)
+            ]
+            for key in stale:
+                del self._cache[key]
+
     def save_recommendations(self, recommendations_df: pd.DataFrame, date: str, route_code: str) -> Dict[str, Any]:
         """
         Save daily recommendations to database with bulk insert
@@ -81,6 +134,8 @@ class RecommendationStorage:
                 cursor.executemany(insert_query, records)
                 conn.commit()
 
+            self.invalidate_cache(date, route_code)
+
             logger.info(f"Saved {len(records)} recommendations to database for {date}, route {route_code}")
 
             return {
@@ -100,22 +155,46 @@ class RecommendationStorage:
                 'records_saved': 0
             }
 
-    def get_recommendations(self, date: str, route_code: Optional[str] = None) -> pd.DataFrame:
+    def get_recommendations(
+        self,
+        date: str,
+        route_code: Optional[str] = None,
+        customer_code: Optional[str] = None
+    ) -> pd.DataFrame:
         """
         Retrieve recommendations from database for a specific date
 
         Args:
             date: Target date (YYYY-MM-DD)
             route_code: Optional route filter
+            customer_code: Optional customer filter (applied in SQL)
 
         Returns:
             DataFrame with recommendations or empty DataFrame if not found
         """
+        cache_key = (
+            date,
+            str(route_code) if route_code else None,
+            str(customer_code) if customer_code else None
+        )
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             # Convert date string to proper format for SQL Server
             from datetime import datetime
             date_obj = datetime.strptime(date, '%Y-%m-%d').date()
 
+            filters = ["CAST(trx_date AS DATE) = ?"]
+            params = [date_obj]
+            if route_code:
+                filters.append("route_code = ?")
+                params.append(str(route_code))
+            if customer_code:
+                filters.append("customer_code = ?")
+                params.append(str(customer_code))
+
             query = f"""
                 SELECT
                     trx_date AS TrxDate,
@@ -133,25 +212,35 @@ class RecommendationStorage:
                     frequency_percent AS FrequencyPercent,
                     generated_at
                 FROM {self.table_name}
-                WHERE CAST(trx_date AS DATE) = ?
-                  {"AND route_code = ?" if route_code else ""}
+                WHERE {" AND ".join(filters)}
                 ORDER BY customer_code, priority_score DESC
             """
 
-            params = (date_obj,) if not route_code else (date_obj, str(route_code))
-            df = self.db_manager.execute_query(query, params)
+            df = self.db_manager.execute_query(query, tuple(params))
+            df = self._compact_dtypes(df)
 
             if not df.empty:
                 logger.info(f"Retrieved {len(df)} recommendations from database for {date}")
             else:
                 logger.info(f"No recommendations found in database for {date}")
 
+            # Empty means "not generated yet", which can change at any moment: don't cache it
+            if not df.empty:
+                self._cache_put(cache_key, df)
             return df
 
         except Exception as e:
             logger.error(f"Failed to retrieve recommendations: {e}", exc_info=True)
             return pd.DataFrame()
 
+    def _compact_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Narrow int64 count columns to int32 (columns holding NULLs are left as loaded)"""
+        narrow = {
+            col: 'int32' for col in self.COMPACT_INT_COLUMNS
+            if col in df.columns and pd.api.types.is_integer_dtype(df[col])
+        }
+        return df.astype(narrow) if narrow else df
+
     def check_exists(self, date: str, route_code: Optional[str] = None) -> bool:
         """
         Check if recommendations exist for a date
@@ -12,6 +12,38 @@ from backend.exceptions import DatabaseException
 
 logger = get_logger(__name__)
 
+# SQL Server caps a statement at 2100 parameters; stay under it when packing rows
+MAX_PARAMS_PER_STATEMENT = 2000
+
+# Customer summary columns, in the order rows are bound into the multi-row MERGE source
+CUSTOMER_SUMMARY_COLUMNS = (
+    'session_id', 'customer_code',
+    'visit_sequence', 'visit_timestamp',
+    'total_skus_recommended', 'total_skus_sold', 'sku_coverage_rate',
+    'total_qty_recommended', 'total_qty_actual', 'qty_fulfillment_rate',
+    'customer_performance_score', 'llm_performance_analysis'
+)
+
+
+def _to_sql_datetime(value: Any) -> Any:
+    """
+    Truncate a datetime to whole milliseconds for binding to a DATETIME column
+
+    fast_executemany binds datetimes at the column's scale, and a value with finer
+    fractional seconds fails with "Datetime field overflow".
+
+    Args:
+        value: Value to bind
+
+    Returns:
+        The value, with microseconds truncated to milliseconds if it is a datetime
+    """
+    if isinstance(value, pd.Timestamp):
+        value = value.to_pydatetime(warn=False)
+    if isinstance(value, datetime):
+        return value.replace(microsecond=value.microsecond // 1000 * 1000)
+    return value
+
 
 class SupervisionStorage:
     """Manages storage and retrieval of supervision sessions in database"""
@@ -120,71 +152,16 @@ class SupervisionStorage:
                 ))
                 logger.info(f"Route summary saved")
 
-                # 2. Upsert Customer Summaries
-                customer_merge = f"""
-                    MERGE INTO {self.customer_table} AS target
-                    USING (SELECT ? AS session_id, ? AS customer_code) AS source
-                    ON target.session_id = source.session_id
-                       AND target.customer_code = source.customer_code
-                    WHEN MATCHED THEN
-                        UPDATE SET
-                            visit_sequence = ?,
-                            visit_timestamp = ?,
-                            total_skus_recommended = ?,
-                            total_skus_sold = ?,
-                            sku_coverage_rate = ?,
-                            total_qty_recommended = ?,
-                            total_qty_actual = ?,
-                            qty_fulfillment_rate = ?,
-                            customer_performance_score = ?,
-                            llm_performance_analysis = ?,
-                            record_saved_at = GETDATE()
-                    WHEN NOT MATCHED THEN
-                        INSERT (
-                            session_id, customer_code,
-                            visit_sequence, visit_timestamp,
-                            total_skus_recommended, total_skus_sold, sku_coverage_rate,
-                            total_qty_recommended, total_qty_actual, qty_fulfillment_rate,
-                            customer_performance_score, llm_performance_analysis
-                        )
-                        VALUES (
-                            ?, ?,
-                            ?, ?,
-                            ?, ?, ?,
-                            ?, ?, ?,
-                            ?, ?
-                        );
-                """
-
-                for customer in customer_summaries:
-                    cursor.execute(customer_merge, (
-                    # MATCHED params
-                    customer['session_id'],
-                    customer['customer_code'],
-                    customer['visit_sequence'],
-                    customer['visit_timestamp'],
-                    customer['total_skus_recommended'],
-                    customer['total_skus_sold'],
-                    customer['sku_coverage_rate'],
-                    customer['total_qty_recommended'],
-                    customer['total_qty_actual'],
-                    customer['qty_fulfillment_rate'],
-                    customer['customer_performance_score'],
-                    customer.get('llm_performance_analysis'),
-                    # NOT MATCHED params
-                    customer['session_id'],
-                    customer['customer_code'],
-                    customer['visit_sequence'],
-                    customer['visit_timestamp'],
-                    customer['total_skus_recommended'],
-                    customer['total_skus_sold'],
-                    customer['sku_coverage_rate'],
-                    customer['total_qty_recommended'],
-                    customer['total_qty_actual'],
-                    customer['qty_fulfillment_rate'],
-                    customer['customer_performance_score'],
-                    customer.get('llm_performance_analysis')
-                ))
+                # 2. Upsert Customer Summaries, many rows per MERGE statement
+                rows_per_statement = max(1, MAX_PARAMS_PER_STATEMENT // len(CUSTOMER_SUMMARY_COLUMNS))
+                for start in range(0, len(customer_summaries), rows_per_statement):
+                    chunk = customer_summaries[start:start + rows_per_statement]
+                    params = [
+                        customer.get(column) if column == 'llm_performance_analysis' else customer[column]
+                        for customer in chunk
+                        for column in CUSTOMER_SUMMARY_COLUMNS
+                    ]
+                    cursor.execute(self._customer_merge_sql(len(chunk)), params)
                 logger.info(f"Customer summaries saved: {len(customer_summaries)} records")
 
                 # 3. Upsert Item Details
@@ -224,8 +201,9 @@ class SupervisionStorage:
                         );
                 """
 
-                for item in item_details:
-                    cursor.execute(item_merge, (
+                # Item rows are fixed-width, so pyodbc can bind them as one parameter array
+                item_rows = [
+                    (
                         # MATCHED params
                         item['session_id'],
                         item['customer_code'],
@@ -255,8 +233,13 @@ class SupervisionStorage:
                         item['days_since_last_purchase'],
                         item['purchase_cycle_days'],
                         item['purchase_frequency_pct'],
-                        item['visit_timestamp']
-                    ))
+                        _to_sql_datetime(item['visit_timestamp'])
+                    )
+                    for item in item_details
+                ]
+                if item_rows:
+                    cursor.fast_executemany = True
+                    cursor.executemany(item_merge, item_rows)
                 logger.info(f"Item details saved: {len(item_details)} records")
 
                 logger.info(f"Committing transaction...")
@@ -283,6 +266,37 @@ class SupervisionStorage:
                 'message': f'Database error: {str(e)}'
             }
 
+    def _customer_merge_sql(self, row_count: int) -> str:
+        """
+        Build a customer summary upsert whose source is row_count parameterized VALUES rows
+
+        Args:
+            row_count: Number of customer rows bound into the statement
+
+        Returns:
+            MERGE statement text
+        """
+        columns = ', '.join(CUSTOMER_SUMMARY_COLUMNS)
+        row_placeholder = '(' + ', '.join(['?'] * len(CUSTOMER_SUMMARY_COLUMNS)) + ')'
+        updates = ',\n                    '.join(
+            f"{column} = source.{column}" for column in CUSTOMER_SUMMARY_COLUMNS[2:]
+        )
+        source_values = ', '.join(f"source.{column}" for column in CUSTOMER_SUMMARY_COLUMNS)
+
+        return f"""
+            MERGE INTO {self.customer_table} AS target
+            USING (VALUES {', '.join([row_placeholder] * row_count)}) AS source ({columns})
+            ON target.session_id = source.session_id
+               AND target.customer_code = source.customer_code
+            WHEN MATCHED THEN
+                UPDATE SET
+                    {updates},
+                    record_saved_at = GETDATE()
+            WHEN NOT MATCHED THEN
+                INSERT ({columns})
+                VALUES ({source_values});
+        """
+
     def load_supervision_session(self, session_id: str) -> Dict[str, Any]:
         """
         Load complete supervision session
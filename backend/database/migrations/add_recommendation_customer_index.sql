@@ -0,0 +1,11 @@
+-- Migration: Add (date, route, customer) index to staged recommendations
+-- Date: 2026-10-16
+-- Purpose: Serve single-customer lookups from the analyze-customer endpoints with an index seek
+
+CREATE NONCLUSTERED INDEX idx_staged_date_route_customer
+ON [YaumiAIML].[dbo].[tbl_staged_recommended_orders] (trx_date, route_code, customer_code)
+INCLUDE (item_code, item_name, recommended_quantity, tier, priority_score);
+
+GO
+
+PRINT 'Migration completed successfully. Customer-level recommendation lookups are now indexed.';
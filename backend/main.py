@@ -36,6 +36,7 @@ from backend.middleware import (
     request_validation_middleware
 )
 from backend.exceptions import ValidationException
+from backend.constants.config_constants import THREADPOOL_THREADS_PER_CPU
 from backend.core import data_manager
 from backend.core.scheduler import start_scheduler, stop_scheduler, get_scheduler_status
 from backend.routes import dashboard, forecast, recommended_order, sales_supervision
@@ -117,6 +118,15 @@ async def lifespan(app: FastAPI):
     logger.info("="*70)
 
     try:
+        # Size the threadpool that runs blocking route work (never below anyio's default)
+        from anyio import to_thread
+        thread_limiter = to_thread.current_default_thread_limiter()
+        thread_limiter.total_tokens = max(
+            thread_limiter.total_tokens,
+            THREADPOOL_THREADS_PER_CPU * (os.cpu_count() or 1)
+        )
+        logger.info(f"Worker threadpool size: {thread_limiter.total_tokens}")
+
         # Start data loading in background thread (truly non-blocking)
         logger.info("Starting background data loading thread...")
         _data_loading_thread = threading.Thread(target=load_data_in_background, daemon=True)
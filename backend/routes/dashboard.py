@@ -21,11 +21,13 @@ async def get_filter_options_endpoint():
     if not data_manager.is_loaded:
         raise HTTPException(status_code=503, detail="Data not loaded yet")
 
-    dashboard_data = data_manager.get_demand_data()
-    options = get_filter_options(dashboard_data)
-
-    # Return with HTTP caching headers for better performance
-    return cached_response(options, cache_type="filter_options")
+    # Options only change when data reloads, so the encoded body/ETag is keyed on the refresh time
+    # and the demand copy + option scan run once per load
+    return cached_response(
+        lambda: get_filter_options(data_manager.get_demand_data()),
+        cache_type="filter_options",
+        cache_key=("dashboard", data_manager.last_refresh)
+    )
 
 @router.post("/dashboard-data")
 async def get_dashboard_data(filters: DashboardFilters):
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from typing import AsyncIterator, Optional, Dict, List
 from backend.models.data_models import RecommendedOrderFilters
 from backend.core import data_manager
 from backend.core.priority_calculator import PriorityCalculator
@@ -10,11 +11,35 @@ from backend.utils.http_cache import cached_response
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import asyncio
+from contextlib import asynccontextmanager
 import warnings
 warnings.filterwarnings('ignore')
 
 router = APIRouter()
 
+# One lock per target date: concurrent requests wait for a single generation run
+# instead of each regenerating (and re-inserting) the same recommendations.
+# Entries are [lock, number of holders and waiters] and are dropped when unused.
+_generation_locks: Dict[str, List] = {}
+
+
+@asynccontextmanager
+async def generation_lock(target_date: str) -> AsyncIterator[None]:
+    """Hold the lock guarding on-demand recommendation generation for a date"""
+    entry = _generation_locks.get(target_date)
+    if entry is None:
+        entry = _generation_locks[target_date] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        # Nobody holds or waits for it: forget the date so the map only tracks dates in use
+        if entry[1] == 0 and _generation_locks.get(target_date) is entry:
+            del _generation_locks[target_date]
+
 class TieredRecommendationSystem:
     """Optimized FMCG recommendation system with unified priority scoring - Exact match with legacy"""
 
@@ -149,10 +174,12 @@ class TieredRecommendationSystem:
         recommendations = []
 
         # OPTIMIZATION: Pre-compute all customer-item histories as nested dictionary for O(1) lookup
+        # Index by customer once (stable sort keeps row order) instead of masking per customer
+        customer_indexed = customer_df.set_index(customer_df['CustomerCode'].to_numpy()).sort_index(kind='stable')
         customer_item_histories = {}
         for customer in journey_customers:
-            cust_history = customer_df[customer_df['CustomerCode'] == customer]
-            if not cust_history.empty:
+            if customer in customer_indexed.index:
+                cust_history = customer_indexed.loc[[customer]]
                 # Convert grouped items to dictionary for instant O(1) lookup
                 customer_item_histories[customer] = {
                     'history': cust_history,
@@ -448,7 +475,8 @@ async def get_recommended_order_filter_options(
 
             # Apply route filter if given
             if route_code and route_code != 'All':
-                rec_df = rec_df[rec_df['RouteCode'].astype(str) == str(route_code)]
+                # Codes were stripped to str above, so compare directly
+                rec_df = rec_df[rec_df['RouteCode'] == str(route_code)]
 
             # Customers strictly from recs; require route filter to avoid over-broad lists
             if route_code and route_code != 'All':
@@ -458,16 +486,14 @@ async def get_recommended_order_filter_options(
                 # Check which customers have actual sales data for this date
                 customers_with_sales = set()
                 try:
-                    customer_df = data_manager.get_customer_data()
-                    if not customer_df.empty and normalized_date:
-                        # Standardize codes
+                    target_sales = data_manager.get_customer_data_for_date(normalized_date) if normalized_date else pd.DataFrame()
+                    if not target_sales.empty:
+                        # Standardize codes (only the day's rows)
                         for col in ['CustomerCode', 'RouteCode']:
-                            if col in customer_df.columns:
-                                customer_df[col] = customer_df[col].astype(str).str.strip()
+                            if col in target_sales.columns:
+                                target_sales[col] = target_sales[col].astype(str).str.strip()
 
-                        # Filter for target date and route
-                        target_dt = pd.to_datetime(normalized_date)
-                        target_sales = customer_df[customer_df['TrxDate'] == target_dt]
+                        # Filter for route
                         if route_code and route_code != 'All':
                             target_sales = target_sales[target_sales['RouteCode'] == str(route_code)]
 
@@ -493,7 +519,7 @@ async def get_recommended_order_filter_options(
             # Items from recs, optionally filtered by customer
             rec_items = rec_df
             if customer_code and customer_code != 'All':
-                rec_items = rec_items[rec_items['CustomerCode'].astype(str) == str(customer_code)]
+                rec_items = rec_items[rec_items['CustomerCode'] == str(customer_code)]
             if not rec_items.empty:
                 items_data = rec_items[['ItemCode', 'ItemName']].drop_duplicates()
                 items = [{"code": str(row['ItemCode']), "name": f"{row['ItemCode']} - {row['ItemName']}"}
@@ -557,45 +583,46 @@ async def pre_generate_daily_recommendations(
 
         storage = get_recommendation_storage()
 
-        # Check if data already exists for this date (any route)
-        info = storage.get_generation_info(target_date)
-        if info and info.get('total_records', 0) > 0:
-            return {
-                "success": True,
-                "message": f"Recommendations already exist for {target_date}",
-                "action": "skipped",
-                "date": target_date,
-                "routes_count": info.get('routes_count', 0),
-                "existing_records": info.get('total_records', 0),
-                "generated_at": info.get('generated_at')
-            }
+        async with generation_lock(target_date):
+            # Check if data already exists for this date (any route)
+            info = storage.get_generation_info(target_date)
+            if info and info.get('total_records', 0) > 0:
+                return {
+                    "success": True,
+                    "message": f"Recommendations already exist for {target_date}",
+                    "action": "skipped",
+                    "date": target_date,
+                    "routes_count": info.get('routes_count', 0),
+                    "existing_records": info.get('total_records', 0),
+                    "generated_at": info.get('generated_at')
+                }
 
-        # Generate recommendations for ALL routes
-        print(f"[CRON] Starting recommendation generation for {target_date} (ALL routes)")
-        start_time = datetime.now()
+            # Generate recommendations for ALL routes
+            print(f"[CRON] Starting recommendation generation for {target_date} (ALL routes)")
+            start_time = datetime.now()
 
-        system = TieredRecommendationSystem()
-        # Pass None to generate for ALL routes
-        recommendations_df = system.process_recommendations(target_date, None)
+            system = TieredRecommendationSystem()
+            # Pass None to generate for ALL routes (off the event loop)
+            recommendations_df = await run_in_threadpool(system.process_recommendations, target_date, None)
 
-        if recommendations_df.empty:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No data available to generate recommendations for {target_date}"
-            )
+            if recommendations_df.empty:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No data available to generate recommendations for {target_date}"
+                )
 
-        # Save per route to database
-        total_saved = 0
-        routes_saved = []
-        for route_code in sorted(recommendations_df['RouteCode'].astype(str).unique()):
-            route_df = recommendations_df[recommendations_df['RouteCode'].astype(str) == route_code]
-            save_result = storage.save_recommendations(route_df, target_date, route_code)
-            if save_result['success']:
-                total_saved += save_result['records_saved']
-                routes_saved.append(route_code)
-                print(f"[CRON] Saved {save_result['records_saved']} recommendations for route {route_code}")
+            # Save per route to database
+            total_saved = 0
+            routes_saved = []
+            # Cast the route column once and split by route (groupby sorts keys like sorted())
+            for route_code, route_df in recommendations_df.groupby(recommendations_df['RouteCode'].astype(str)):
+                save_result = storage.save_recommendations(route_df, target_date, route_code)
+                if save_result['success']:
+                    total_saved += save_result['records_saved']
+                    routes_saved.append(route_code)
+                    print(f"[CRON] Saved {save_result['records_saved']} recommendations for route {route_code}")
 
-        generation_time = (datetime.now() - start_time).total_seconds()
+            generation_time = (datetime.now() - start_time).total_seconds()
 
         if total_saved > 0:
             print(f"[CRON] Successfully saved {total_saved} recommendations across {len(routes_saved)} routes for {target_date}")
@@ -661,33 +688,37 @@ async def get_recommended_order_data(filters: RecommendedOrderFilters):
         data_source = "database"
 
         if recommendations_df.empty:
-            # Not in database - generate on demand for ALL routes (SLOW - first time only)
-            print(f"[INFO] No recommendations in database for {target_date}, generating for ALL routes...")
-
-            try:
-                system = TieredRecommendationSystem()
-                # Pass None to generate for ALL routes
-                recommendations_df = system.process_recommendations(target_date, None)
+            async with generation_lock(target_date):
+                # Another request may have generated this date while we waited
+                recommendations_df = storage.get_recommendations(target_date, single_route)
 
                 if recommendations_df.empty:
-                    raise HTTPException(status_code=404, detail=f"No data available for {target_date}")
+                    # Not in database - generate on demand for ALL routes (SLOW - first time only)
+                    print(f"[INFO] No recommendations in database for {target_date}, generating for ALL routes...")
 
-                print(f"Generated {len(recommendations_df)} recommendations for {target_date} (ALL routes)")
+                    try:
+                        system = TieredRecommendationSystem()
+                        # Pass None to generate for ALL routes (off the event loop)
+                        recommendations_df = await run_in_threadpool(system.process_recommendations, target_date, None)
 
-                # Save per route to database for next time
-                total_saved = 0
-                for route_code in sorted(recommendations_df['RouteCode'].astype(str).unique()):
-                    route_df = recommendations_df[recommendations_df['RouteCode'].astype(str) == route_code]
-                    save_result = storage.save_recommendations(route_df, target_date, route_code)
-                    if save_result['success']:
-                        total_saved += save_result['records_saved']
-                        print(f"[INFO] Saved {save_result['records_saved']} recommendations for route {route_code}")
+                        if recommendations_df.empty:
+                            raise HTTPException(status_code=404, detail=f"No data available for {target_date}")
 
-                print(f"[INFO] Total saved: {total_saved} recommendations to database")
-                data_source = "generated"
+                        print(f"Generated {len(recommendations_df)} recommendations for {target_date} (ALL routes)")
 
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=f"Failed to generate recommendations for {target_date}: {str(e)}")
+                        # Save per route to database for next time
+                        total_saved = 0
+                        for route_code, route_df in recommendations_df.groupby(recommendations_df['RouteCode'].astype(str)):
+                            save_result = storage.save_recommendations(route_df, target_date, route_code)
+                            if save_result['success']:
+                                total_saved += save_result['records_saved']
+                                print(f"[INFO] Saved {save_result['records_saved']} recommendations for route {route_code}")
+
+                        print(f"[INFO] Total saved: {total_saved} recommendations to database")
+                        data_source = "generated"
+
+                    except Exception as e:
+                        raise HTTPException(status_code=500, detail=f"Failed to generate recommendations for {target_date}: {str(e)}")
         else:
             print(f"[INFO] Loaded {len(recommendations_df)} recommendations from database for {target_date}")
             data_source = "database"
@@ -719,16 +750,12 @@ async def get_recommended_order_data(filters: RecommendedOrderFilters):
             }
 
         # Fetch live actual quantities from cached customer_data
-        customer_df = data_manager.get_customer_data()
-        if not customer_df.empty:
-            # Standardize codes
+        target_sales = data_manager.get_customer_data_for_date(target_date)
+        if not target_sales.empty:
+            # Standardize codes (only the day's rows)
             for col in ['CustomerCode', 'ItemCode', 'RouteCode']:
-                if col in customer_df.columns:
-                    customer_df[col] = customer_df[col].astype(str).str.strip()
-
-            # Filter for target date
-            target_dt = pd.to_datetime(target_date)
-            target_sales = customer_df[customer_df['TrxDate'] == target_dt]
+                if col in target_sales.columns:
+                    target_sales[col] = target_sales[col].astype(str).str.strip()
 
             # Create lookup dictionary: (RouteCode, CustomerCode, ItemCode) -> TotalQuantity
             actual_dict = {}
@@ -799,8 +826,9 @@ async def get_recommended_order_data(filters: RecommendedOrderFilters):
 
         if multiple_customers:
             # Customer-based aggregation with item breakdown
-            for customer_code in sorted(filtered_df['CustomerCode'].unique()):
-                customer_items = filtered_df[filtered_df['CustomerCode'] == customer_code]
+            customers_indexed = filtered_df.set_index(filtered_df['CustomerCode'].to_numpy()).sort_index(kind='stable')
+            for customer_code in customers_indexed.index.unique():
+                customer_items = customers_indexed.loc[[customer_code]]
 
                 # Build customer breakdown (all items for this customer)
                 customer_breakdown = []
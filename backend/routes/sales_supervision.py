@@ -1,9 +1,15 @@
 from fastapi import APIRouter, HTTPException, Body, Request
-from typing import Dict, Any
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from typing import Dict, Any, Optional
+from collections import defaultdict
 from datetime import datetime
+import numpy as np
 import pandas as pd
+import math
 import os
 import sys
+import uuid
 import logging
 
 # Add backend to path
@@ -11,17 +17,49 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.core import data_manager
 from backend.models.data_models import SalesSupervisionFilters
-from backend.routes.recommended_order import TieredRecommendationSystem
-from backend.core.dynamic_supervisor import get_or_create_session, clear_session
+from backend.routes.recommended_order import TieredRecommendationSystem, generation_lock
+from backend.core.dynamic_supervisor import get_or_create_session, reset_or_create_session
 from backend.core.llm_analyzer import llm_analyzer
 from backend.core.recommendation_storage import get_recommendation_storage
+from backend.core.supervision_storage import get_supervision_storage
+from backend.core.llm_cache import get_llm_cache, get_rate_limiter
 
-router = APIRouter()
+# Route/customer payloads are large nested lists; orjson encodes them much faster than stdlib json.
+# The largest endpoints also return ORJSONResponse instances directly, which skips FastAPI's
+# jsonable_encoder walk over the whole dict.
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
 # All recommendations are now stored in database (tbl_recommended_orders)
 # No CSV files or local directories needed
 
+# Current visit item fields: recommendation column -> response key, and their response dtypes
+CURRENT_ITEM_COLUMNS = {
+    'ItemCode': 'itemCode',
+    'ItemName': 'itemName',
+    'RecommendedQuantity': 'recommendedQuantity',
+    'ActualQuantity': 'actualQuantity'
+}
+CURRENT_ITEM_DTYPES = {'ItemCode': str, 'ItemName': str, 'RecommendedQuantity': 'int64', 'ActualQuantity': 'int64'}
+
+# Saved item detail fields copied from recommendations: detail key -> (column, default if absent, dtype)
+SAVED_ITEM_FIELDS = {
+    'recommendation_tier': ('Tier', 'Unknown', str),
+    'priority_score': ('PriorityScore', 0.0, float),
+    'van_inventory_qty': ('VanLoad', 0, 'int64'),
+    'days_since_last_purchase': ('DaysSinceLastPurchase', 0, 'int64'),
+    'purchase_cycle_days': ('PurchaseCycleDays', 0.0, float),
+    'purchase_frequency_pct': ('FrequencyPercent', 0.0, float)
+}
+
+
+def _column_values(df: pd.DataFrame, column: str, default: Any, dtype: Any) -> list:
+    """Column as a list of native Python values, or the default for every row if the column is absent"""
+    if column not in df.columns:
+        return [default] * len(df)
+    return df[column].astype(dtype).tolist()
+
+
 def calculate_item_accuracy(actual_qty: int, recommended_qty: int) -> float:
     """
     Calculate item accuracy score with perfect zone (75-120% of recommended).
@@ -30,24 +68,40 @@ def calculate_item_accuracy(actual_qty: int, recommended_qty: int) -> float:
     if recommended_qty == 0:
         return 100.0 if actual_qty == 0 else 0.0
 
-    if actual_qty == 0:
+    achievement_pct = (actual_qty / recommended_qty) * 100
+    # min() would skip a NaN and score it 100; a missing actual scores 0
+    if math.isnan(achievement_pct):
         return 0.0
 
-    achievement_pct = (actual_qty / recommended_qty) * 100
+    # Rising edge below 75%, flat 100 in the 75-120% zone, falling edge reaching 0 at 200%:
+    # the piecewise penalty is the lower of the two edges, clamped to [0, 100]
+    return max(0.0, min(100.0, achievement_pct / 75 * 100, 100 - (achievement_pct - 120) / 80 * 100))
+
+def calculate_item_accuracy_array(actual_qty: np.ndarray, recommended_qty: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_item_accuracy over aligned quantity arrays.
+    Same closed-form clamp of the two penalty edges, computed in place.
+    """
+    actual = np.asarray(actual_qty, dtype=np.float64)
+    recommended = np.asarray(recommended_qty, dtype=np.float64)
+
+    no_recommendation = recommended == 0
+    achievement_pct = np.divide(
+        actual, recommended, out=np.full_like(actual, np.nan), where=~no_recommendation
+    )
+    achievement_pct *= 100
+
+    accuracy = achievement_pct / 75 * 100
+    np.minimum(accuracy, 100 - (achievement_pct - 120) / 80 * 100, out=accuracy)
+    np.clip(accuracy, 0.0, 100.0, out=accuracy)
 
-    # Perfect zone: 75-120%
-    if 75 <= achievement_pct <= 120:
-        return 100.0
+    # Missing actuals score 0, matching the scalar version
+    accuracy[np.isnan(achievement_pct)] = 0.0
 
-    # Below 75%: Linear penalty from 0% to 75%
-    elif achievement_pct < 75:
-        return max(0, (achievement_pct / 75) * 100)
+    # Nothing recommended: only an exact zero counts as accurate
+    accuracy[no_recommendation] = np.where(actual[no_recommendation] == 0, 100.0, 0.0)
 
-    # Above 120%: Linear penalty from 120% to 200%
-    else:
-        if achievement_pct >= 200:
-            return 0.0
-        return max(0, 100 - ((achievement_pct - 120) / 80 * 100))
+    return accuracy
 
 def calculate_customer_score(customer_data: pd.DataFrame) -> Dict[str, float]:
     """
@@ -57,22 +111,14 @@ def calculate_customer_score(customer_data: pd.DataFrame) -> Dict[str, float]:
     if customer_data.empty:
         return {'score': 0.0, 'coverage': 0.0, 'accuracy': 0.0}
 
-    total_items = len(customer_data)
-    items_sold = len(customer_data[customer_data['ActualQuantity'] > 0])
+    actual = customer_data['ActualQuantity'].to_numpy(dtype=np.float64)
+    recommended = customer_data['RecommendedQuantity'].to_numpy(dtype=np.float64)
 
     # Coverage: percentage of items sold
-    coverage_score = (items_sold / total_items) * 100
+    coverage_score = float((actual > 0).mean() * 100)
 
     # Accuracy: average accuracy of all items
-    accuracy_scores = []
-    for _, item_row in customer_data.iterrows():
-        item_accuracy = calculate_item_accuracy(
-            item_row['ActualQuantity'],
-            item_row['RecommendedQuantity']
-        )
-        accuracy_scores.append(item_accuracy)
-
-    accuracy_score = sum(accuracy_scores) / len(accuracy_scores) if accuracy_scores else 0.0
+    accuracy_score = float(calculate_item_accuracy_array(actual, recommended).mean())
 
     # Final score: Coverage (40%) + Accuracy (60%)
     final_score = (coverage_score * 0.4) + (accuracy_score * 0.6)
@@ -90,34 +136,18 @@ async def get_sales_supervision_filter_options():
         if not data_manager.is_loaded:
             raise HTTPException(status_code=503, detail="Data not loaded yet")
         
-        # Get data from data manager
-        demand_df = data_manager.get_demand_data()
-        journey_df = data_manager.get_journey_plan()
-        
-        # Get unique routes
-        routes = sorted(demand_df['RouteCode'].unique().tolist())
-        route_options = [{"code": str(route), "name": str(route)} for route in routes]
-        
-        # Get unique dates from journey plan (these are the valid supervision dates)
-        dates = []
-        if not journey_df.empty:
-            dates = journey_df['JourneyDate'].dt.strftime('%Y-%m-%d').unique().tolist()
-            dates.sort()
-        
-        return {
-            "routes": route_options,
-            "dates": dates
-        }
+        # Routes come from demand data; dates from the journey plan (the valid supervision
+        # dates). Both lists are built once per data load by the data manager.
+        return data_manager.get_filter_options()
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to load filter options: {e}")
+        logger.error("Failed to load filter options: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/get-sales-data")
-async def get_sales_supervision_data(filters: SalesSupervisionFilters):
+def _compute_sales_data(filters: SalesSupervisionFilters) -> Dict[str, Any]:
     """Get sales supervision data for a specific route and date"""
     try:
         route_code = filters.route_code
@@ -131,47 +161,35 @@ async def get_sales_supervision_data(filters: SalesSupervisionFilters):
         if not data_manager.is_loaded:
             raise HTTPException(status_code=503, detail="Data not loaded yet. Please wait for data initialization.")
         
-        # Load demand data from data manager
-        demand_df = data_manager.get_demand_data()
-        
-        # Convert TrxDate to datetime if not already
-        demand_df['TrxDate'] = pd.to_datetime(demand_df['TrxDate'])
-        
         # Parse target date
         try:
             target_date_parsed = pd.to_datetime(target_date)
         except:
             raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD format.")
         
-        # Filter demand data by route and date
-        demand_filtered = demand_df[
-            (demand_df['RouteCode'].astype(str) == str(route_code)) & 
-            (demand_df['TrxDate'].dt.date == target_date_parsed.date())
-        ]
+        # Per-item demand for this route/day: Predicted (allocated) and TotalQuantity (actual)
+        # summed, AvgUnitPrice averaged - aggregated and memoized by the data manager
+        demand_grouped = data_manager.get_demand_aggregated(route_code, target_date_parsed)
         
         # Prepare demand section data
         demand_items = []
-        if not demand_filtered.empty:
-            # The merged demand data has columns: TotalQuantity, AvgUnitPrice, Predicted
-            # Group by item to get aggregated demand
-            demand_grouped = demand_filtered.groupby(['ItemCode', 'ItemName']).agg({
-                'Predicted': 'sum',  # Use Predicted as allocated quantity
-                'TotalQuantity': 'sum',  # Actual quantity
-                'AvgUnitPrice': 'mean'  # Average price
-            }).reset_index()
+        total_allocated_qty = 0
+        total_demand_qty = 0
+        if not demand_grouped.empty:
+            total_allocated_qty = float(demand_grouped['Predicted'].sum())
+            total_demand_qty = float(demand_grouped['TotalQuantity'].sum())
             
-            for _, row in demand_grouped.iterrows():
-                demand_items.append({
-                    "itemCode": str(row['ItemCode']),
-                    "itemName": str(row['ItemName']),
-                    "allocatedQuantity": float(row['Predicted']),  # Predicted as allocated
-                    "totalQuantity": float(row['TotalQuantity']),  # Actual quantity
-                    "avgPrice": round(float(row['AvgUnitPrice']), 2) if pd.notna(row['AvgUnitPrice']) else 0
-                })
+            demand_items = pd.DataFrame({
+                "itemCode": demand_grouped['ItemCode'].astype(str),
+                "itemName": demand_grouped['ItemName'].astype(str),
+                "allocatedQuantity": demand_grouped['Predicted'].astype(float),  # Predicted as allocated
+                "totalQuantity": demand_grouped['TotalQuantity'].astype(float),  # Actual quantity
+                "avgPrice": demand_grouped['AvgUnitPrice'].astype(float).round(2).fillna(0)
+            }).to_dict('records')
         
         # Check if recommended order exists in database for this date
         recommended_order_data = []
-        customer_scores = {}
+        customer_scores = np.empty(0, dtype=np.float64)
 
         # Get recommendations from database
         storage = get_recommendation_storage()
@@ -181,24 +199,21 @@ async def get_sales_supervision_data(filters: SalesSupervisionFilters):
             # Recommendations exist in database
             rec_filtered = rec_df
 
-            # Fetch live actual quantities from cached customer_data
-            customer_sales_df = data_manager.get_customer_data()
+            # Fetch live actual quantities for the target day from cached customer_data
+            target_sales = data_manager.get_customer_data_for_date(target_date_parsed)
             actual_dict = {}
 
-            if not customer_sales_df.empty:
-                # Standardize codes
+            if not target_sales.empty:
+                # Standardize codes (only the day's rows)
                 for col in ['CustomerCode', 'ItemCode', 'RouteCode']:
-                    if col in customer_sales_df.columns:
-                        customer_sales_df[col] = customer_sales_df[col].astype(str).str.strip()
-
-                # Filter for target date
-                target_dt = pd.to_datetime(target_date)
-                target_sales = customer_sales_df[customer_sales_df['TrxDate'] == target_dt]
+                    if col in target_sales.columns:
+                        target_sales[col] = target_sales[col].astype(str).str.strip()
 
                 # Create lookup dictionary: (RouteCode, CustomerCode, ItemCode) -> TotalQuantity
-                for _, row in target_sales.iterrows():
-                    key = (str(row['RouteCode']), str(row['CustomerCode']), str(row['ItemCode']))
-                    actual_dict[key] = row['TotalQuantity']
+                sales_columns = ['RouteCode', 'CustomerCode', 'ItemCode', 'TotalQuantity']
+                for row in target_sales[sales_columns].itertuples(index=False):
+                    key = (str(row.RouteCode), str(row.CustomerCode), str(row.ItemCode))
+                    actual_dict[key] = row.TotalQuantity
 
             # Add ActualQuantity to rec_filtered based on live data
             if actual_dict:
@@ -214,67 +229,72 @@ async def get_sales_supervision_data(filters: SalesSupervisionFilters):
                 rec_filtered['ActualQuantity'] = 0
 
             if not rec_filtered.empty:
-                # Group by customer
-                customers = rec_filtered['CustomerCode'].unique()
-
-                for customer in customers:
-                    customer_data = rec_filtered[rec_filtered['CustomerCode'] == customer]
-                    
-                    # Calculate performance score with new algorithm
-                    total_recommended = customer_data['RecommendedQuantity'].sum()
-                    total_actual = customer_data['ActualQuantity'].sum()
-
-                    # Get score breakdown (score, coverage, accuracy)
-                    score_data = calculate_customer_score(customer_data)
-
-                    customer_scores[str(customer)] = score_data['score']
-
-                    # Prepare customer items
-                    items = []
-                    for _, item_row in customer_data.iterrows():
-                        item_actual = int(item_row['ActualQuantity'])
-                        item_recommended = int(item_row['RecommendedQuantity'])
-
-                        # Calculate item accuracy
-                        item_accuracy = calculate_item_accuracy(item_actual, item_recommended)
-
-                        # Handle both old and new recommendation formats
-                        prob_percent = 0.0
-                        urgency_score = 0.0
-
-                        if 'PriorityScore' in item_row:
-                            priority_score = float(item_row['PriorityScore'])
-                            prob_percent = priority_score
-                            urgency_score = priority_score
-                        else:
-                            prob_percent = float(item_row.get('ProbabilityPercent', 0))
-                            urgency_score = float(item_row.get('UrgencyScore', 0))
-
-                        items.append({
-                            "itemCode": str(item_row['ItemCode']),
-                            "itemName": str(item_row['ItemName']),
-                            "actualQuantity": item_actual,
-                            "recommendedQuantity": item_recommended,
-                            "accuracy": round(item_accuracy, 1),
-                            "tier": str(item_row['Tier']),
-                            "probabilityPercent": prob_percent,
-                            "urgencyScore": urgency_score
-                        })
+                # Handle both old and new recommendation formats
+                if 'PriorityScore' in rec_filtered.columns:
+                    prob_percent = rec_filtered['PriorityScore'].astype(float)
+                    urgency_score = prob_percent
+                else:
+                    prob_percent = rec_filtered.get('ProbabilityPercent', 0)
+                    urgency_score = rec_filtered.get('UrgencyScore', 0)
+
+                # Item response fields, coerced once per column for the whole route
+                item_actual = rec_filtered['ActualQuantity'].astype('int64')
+                item_recommended = rec_filtered['RecommendedQuantity'].astype('int64')
+                item_accuracy = calculate_item_accuracy_array(item_actual, item_recommended)
+                item_records = pd.DataFrame({
+                    "itemCode": rec_filtered['ItemCode'].astype(str),
+                    "itemName": rec_filtered['ItemName'].astype(str),
+                    "actualQuantity": item_actual,
+                    "recommendedQuantity": item_recommended,
+                    "accuracy": np.round(item_accuracy, 1),
+                    "tier": rec_filtered['Tier'].astype(str),
+                    "probabilityPercent": prob_percent,
+                    "urgencyScore": urgency_score
+                }, index=rec_filtered.index).astype({'probabilityPercent': float, 'urgencyScore': float})
+
+                # Per-customer totals and score components in one groupby pass
+                # (same formula as calculate_customer_score)
+                customer_codes = rec_filtered['CustomerCode']
+                customer_metrics = pd.DataFrame({
+                    'CustomerCode': customer_codes,
+                    'recommended': item_recommended,
+                    'actual': item_actual,
+                    'sold': item_actual > 0,
+                    'accuracy': item_accuracy
+                }).groupby('CustomerCode', sort=False).agg(
+                    total_recommended=('recommended', 'sum'),
+                    total_actual=('actual', 'sum'),
+                    coverage=('sold', 'mean'),
+                    accuracy=('accuracy', 'mean')
+                )
+                customer_metrics['coverage'] *= 100
+                raw_scores = customer_metrics['coverage'] * 0.4 + customer_metrics['accuracy'] * 0.6
+                # Python round() (not np.round) so scores match the per-customer endpoints exactly
+                customer_metrics['score'] = [round(score, 1) for score in raw_scores.tolist()]
+                customer_scores = customer_metrics['score'].to_numpy()
+
+                # Sort customers by score (highest first); stable, so ties keep route order
+                customer_metrics = customer_metrics.sort_values('score', ascending=False, kind='stable')
+
+                # Materialize every item dict once, then hand each customer its rows by position;
+                # itertuples yields native Python numbers, so no per-field coercion is needed
+                item_dicts = item_records.to_dict('records')
+                item_positions = item_records.groupby(customer_codes, sort=False).indices
+                for metrics in customer_metrics.itertuples():
+                    customer = metrics.Index
+                    items = [item_dicts[i] for i in item_positions[customer]]
 
                     recommended_order_data.append({
                         "customerCode": str(customer),
                         "customerName": f"Customer {customer}",
-                        "score": score_data['score'],
-                        "coverage": score_data['coverage'],
-                        "accuracy": score_data['accuracy'],
+                        "score": metrics.score,
+                        "coverage": round(metrics.coverage, 1),
+                        "accuracy": round(metrics.accuracy, 1),
                         "items": items,
                         "totalItems": len(items),
-                        "totalRecommendedQty": int(total_recommended),
-                        "totalActualQty": int(total_actual)
+                        "totalRecommendedQty": metrics.total_recommended,
+                        "totalActualQty": metrics.total_actual
                     })
-                
-                # Sort customers by score (highest first)
-                recommended_order_data = sorted(recommended_order_data, key=lambda x: x['score'], reverse=True)
         
         return {
             "route": str(route_code),
@@ -282,14 +302,14 @@ async def get_sales_supervision_data(filters: SalesSupervisionFilters):
             "demandSection": {
                 "items": demand_items,
                 "totalItems": len(demand_items),
-                "totalAllocatedQty": sum(item['allocatedQuantity'] for item in demand_items),
-                "totalQty": sum(item['totalQuantity'] for item in demand_items)
+                "totalAllocatedQty": total_allocated_qty,
+                "totalQty": total_demand_qty
             },
             "recommendedOrderSection": {
                 "hasData": len(recommended_order_data) > 0,
                 "customers": recommended_order_data,
                 "totalCustomers": len(recommended_order_data),
-                "avgScore": round(sum(c['score'] for c in recommended_order_data) / len(recommended_order_data), 1) if recommended_order_data else 0,
+                "avgScore": round(float(customer_scores.mean()), 1) if customer_scores.size else 0,
                 "scoreType": "performance"  # Indicates this is actual vs recommended performance
             }
         }
@@ -297,10 +317,16 @@ async def get_sales_supervision_data(filters: SalesSupervisionFilters):
     except HTTPException:
         raise  # Re-raise HTTPExceptions with original status codes
     except Exception as e:
-        logger.error(f"Unexpected error in get_sales_supervision_data: {str(e)}")
+        logger.error("Unexpected error in get_sales_supervision_data: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get sales supervision data: {str(e)}")
 
 
+@router.post("/get-sales-data")
+async def get_sales_supervision_data(filters: SalesSupervisionFilters):
+    """Get sales supervision data for a specific route and date"""
+    return ORJSONResponse(await run_in_threadpool(_compute_sales_data, filters))
+
+
 # Removed: /generate-recommendations-for-date endpoint
 # Now uses unified /api/v1/recommended-order/get-recommendations-data endpoint
 # Frontend calls getRecommendedOrderData() which auto-generates if needed
@@ -316,11 +342,8 @@ async def initialize_dynamic_session(filters: SalesSupervisionFilters):
         if not route_code or not target_date:
             raise HTTPException(status_code=400, detail="Route code and date are required")
 
-        # Clear any existing session for this route/date
-        clear_session(route_code, target_date)
-
-        # Create new session
-        session = get_or_create_session(route_code, target_date)
+        # Replace any existing session for this route/date with a fresh one
+        session = reset_or_create_session(route_code, target_date)
 
         # Parse date
         try:
@@ -333,21 +356,28 @@ async def initialize_dynamic_session(filters: SalesSupervisionFilters):
         rec_df = storage.get_recommendations(target_date, str(route_code) if route_code != 'All' else None)
 
         if rec_df.empty:
-            # Generate recommendations if not exists in database
-            logger.info(f"Recommendations not found in database, generating for {target_date}")
-            system = TieredRecommendationSystem()
-            results = system.process_recommendations(target_date, route_code if route_code != 'All' else None)
+            async with generation_lock(target_date):
+                # Another request may have generated these while we waited
+                rec_df = storage.get_recommendations(target_date, str(route_code) if route_code != 'All' else None)
 
-            if results.empty:
-                raise HTTPException(status_code=404, detail=f"No recommendations could be generated for {target_date}")
+                if rec_df.empty:
+                    # Generate recommendations if not exists in database (off the event loop)
+                    logger.info("Recommendations not found in database, generating for %s", target_date)
+                    system = TieredRecommendationSystem()
+                    results = await run_in_threadpool(
+                        system.process_recommendations, target_date, route_code if route_code != 'All' else None
+                    )
 
-            # Save to database
-            save_result = storage.save_recommendations(results, target_date, str(route_code) if route_code != 'All' else '1004')
-            if not save_result['success']:
-                logger.warning(f"Failed to save recommendations to database: {save_result['message']}")
+                    if results.empty:
+                        raise HTTPException(status_code=404, detail=f"No recommendations could be generated for {target_date}")
 
-            # Use the generated results
-            rec_df = results
+                    # Save to database
+                    save_result = storage.save_recommendations(results, target_date, str(route_code) if route_code != 'All' else '1004')
+                    if not save_result['success']:
+                        logger.warning("Failed to save recommendations to database: %s", save_result['message'])
+
+                    # Use the generated results
+                    rec_df = results
 
         if rec_df.empty:
             raise HTTPException(status_code=404, detail=f"No recommendations found for route {route_code} on {target_date}")
@@ -370,7 +400,7 @@ async def initialize_dynamic_session(filters: SalesSupervisionFilters):
     except HTTPException as e:
         raise e
     except Exception as e:
-        logger.error(f"Failed to initialize session: {str(e)}")
+        logger.error("Failed to initialize session: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to initialize session: {str(e)}")
 
 
@@ -400,7 +430,7 @@ async def process_customer_visit(request: Dict[str, Any] = Body(...)):
     except HTTPException as e:
         raise e
     except Exception as e:
-        logger.error(f"Failed to process visit: {str(e)}")
+        logger.error("Failed to process visit: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to process visit: {str(e)}")
 
 
@@ -421,12 +451,79 @@ async def get_session_summary(filters: SalesSupervisionFilters):
         return session.get_session_summary()
 
     except Exception as e:
-        logger.error(f"Failed to get session summary: {str(e)}")
+        logger.error("Failed to get session summary: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get session summary: {str(e)}")
 
 
-@router.post("/analyze-customer")
-async def analyze_customer_performance(request: Dict[str, Any] = Body(...)):
+def _analyze_customer(
+    customer_code: str,
+    route_code: str,
+    date: str,
+    actual_quantities: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Shared body of the analyze-customer endpoints: load the customer's recommendations
+    (filtered in SQL), apply any frontend quantity edits, score, and run the LLM analysis.
+    """
+    # Load this customer's recommendations from database (filtered in SQL)
+    storage = get_recommendation_storage()
+    customer_rec_data = storage.get_recommendations(date, str(route_code), customer_code=str(customer_code))
+
+    if customer_rec_data.empty:
+        if not storage.check_exists(date, str(route_code)):
+            raise HTTPException(status_code=404, detail="Recommended order data not found for this date and route")
+        raise HTTPException(status_code=404, detail="No data found for this customer")
+
+    # Update actual quantities with frontend edits (simulating real-time visit updates)
+    if actual_quantities:
+        edits = pd.to_numeric(pd.Series(actual_quantities), errors='coerce')
+        edited_qty = customer_rec_data['ItemCode'].astype(str).map(edits)
+        customer_rec_data['ActualQuantity'] = (
+            edited_qty.fillna(customer_rec_data.get('ActualQuantity', 0)).fillna(0).astype('int64')
+        )
+
+    # Calculate performance score
+    score_data = calculate_customer_score(customer_rec_data)
+
+    # Reduce everything the response needs before the (network-bound) LLM call
+    skus_sold = int((customer_rec_data['ActualQuantity'] > 0).sum())
+    total_recommended = int(customer_rec_data['RecommendedQuantity'].sum())
+    total_actual = int(customer_rec_data['ActualQuantity'].sum())
+
+    # Format current visit items
+    current_items = (
+        customer_rec_data[list(CURRENT_ITEM_COLUMNS)]
+        .astype(CURRENT_ITEM_DTYPES)
+        .rename(columns=CURRENT_ITEM_COLUMNS)
+        .to_dict('records')
+    )
+
+    # Generate advanced analysis - returns structured JSON
+    analysis_json = llm_analyzer.analyze_customer_performance(
+        customer_code=customer_code,
+        route_code=route_code,
+        date=date,
+        customer_data=customer_rec_data,
+        current_items=current_items,
+        performance_score=score_data['score'],
+        coverage=score_data['coverage'],
+        accuracy=score_data['accuracy']
+    )
+
+    # Return merged response with analysis and metrics
+    return {
+        **analysis_json,
+        "performance_score": score_data['score'],
+        "coverage": score_data['coverage'],
+        "accuracy": score_data['accuracy'],
+        "total_items": len(current_items),
+        "skus_sold": skus_sold,
+        "total_recommended": total_recommended,
+        "total_actual": total_actual
+    }
+
+
+def _compute_customer_analysis(request: Dict[str, Any]) -> Dict[str, Any]:
     """Generate advanced analysis for individual customer performance"""
     try:
         customer_code = request.get('customer_code')
@@ -436,77 +533,28 @@ async def analyze_customer_performance(request: Dict[str, Any] = Body(...)):
         if not all([customer_code, route_code, date]):
             raise HTTPException(status_code=400, detail="Missing required parameters")
 
-        # Parse date
+        # Validate date
         try:
-            parsed_date = datetime.strptime(date, '%Y-%m-%d')
+            datetime.strptime(date, '%Y-%m-%d')
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD format.")
 
-        # Load recommendations from database
-        storage = get_recommendation_storage()
-        rec_df = storage.get_recommendations(date, str(route_code))
-
-        if rec_df.empty:
-            raise HTTPException(status_code=404, detail="Recommended order data not found for this date and route")
-
-        # Filter by route and customer
-        customer_rec_data = rec_df[
-            (rec_df['RouteCode'].astype(str) == str(route_code)) &
-            (rec_df['CustomerCode'].astype(str) == str(customer_code))
-        ]
-
-        if customer_rec_data.empty:
-            raise HTTPException(status_code=404, detail="No data found for this customer")
-
-        # Calculate performance score with new algorithm
-        score_data = calculate_customer_score(customer_rec_data)
-
-        # Format current visit items
-        current_items = []
-        for _, item_row in customer_rec_data.iterrows():
-            current_items.append({
-                'itemCode': str(item_row['ItemCode']),
-                'itemName': str(item_row['ItemName']),
-                'recommendedQuantity': int(item_row['RecommendedQuantity']),
-                'actualQuantity': int(item_row['ActualQuantity'])
-            })
-
-        # Calculate SKUs sold
-        skus_sold = len(customer_rec_data[customer_rec_data['ActualQuantity'] > 0])
-
-        # Generate advanced analysis - returns structured JSON
-        analysis_json = llm_analyzer.analyze_customer_performance(
-            customer_code=customer_code,
-            route_code=route_code,
-            date=date,
-            customer_data=customer_rec_data,
-            current_items=current_items,
-            performance_score=score_data['score'],
-            coverage=score_data['coverage'],
-            accuracy=score_data['accuracy']
-        )
-
-        # Return merged response with analysis and metrics
-        return {
-            **analysis_json,
-            "performance_score": score_data['score'],
-            "coverage": score_data['coverage'],
-            "accuracy": score_data['accuracy'],
-            "total_items": len(current_items),
-            "skus_sold": skus_sold,
-            "total_recommended": int(customer_rec_data['RecommendedQuantity'].sum()),
-            "total_actual": int(customer_rec_data['ActualQuantity'].sum())
-        }
+        return _analyze_customer(customer_code, route_code, date)
 
     except HTTPException as e:
         raise e
     except Exception as e:
-        logger.error(f"Failed to analyze customer performance: {str(e)}")
+        logger.error("Failed to analyze customer performance: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to generate analysis: {str(e)}")
 
 
-@router.post("/analyze-customer-with-updates")
-async def analyze_customer_performance_with_updates(request: Dict[str, Any] = Body(...)):
+@router.post("/analyze-customer")
+async def analyze_customer_performance(request: Dict[str, Any] = Body(...)):
+    """Generate advanced analysis for individual customer performance"""
+    return ORJSONResponse(await run_in_threadpool(_compute_customer_analysis, request))
+
+
+def _compute_customer_analysis_with_updates(request: Dict[str, Any]) -> Dict[str, Any]:
     """Generate advanced analysis for customer with updated actual quantities"""
     try:
         customer_code = request.get('customer_code')
@@ -517,81 +565,28 @@ async def analyze_customer_performance_with_updates(request: Dict[str, Any] = Bo
         if not all([customer_code, route_code, date]):
             raise HTTPException(status_code=400, detail="Missing required parameters")
 
-        # Parse date
+        # Validate date
         try:
-            parsed_date = datetime.strptime(date, '%Y-%m-%d')
+            datetime.strptime(date, '%Y-%m-%d')
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD format.")
 
-        # Load recommendations from database
-        storage = get_recommendation_storage()
-        rec_df = storage.get_recommendations(date, str(route_code))
-
-        if rec_df.empty:
-            raise HTTPException(status_code=404, detail="Recommended order data not found for this date and route")
-        customer_rec_data = rec_df[
-            (rec_df['RouteCode'].astype(str) == str(route_code)) &
-            (rec_df['CustomerCode'].astype(str) == str(customer_code))
-        ].copy()
-
-        if customer_rec_data.empty:
-            raise HTTPException(status_code=404, detail="No data found for this customer")
-
-        # Update actual quantities with frontend edits (simulating real-time visit updates)
-        for idx, item_row in customer_rec_data.iterrows():
-            item_code = str(item_row['ItemCode'])
-            if item_code in actual_quantities:
-                customer_rec_data.at[idx, 'ActualQuantity'] = actual_quantities[item_code]
-
-        # Calculate performance score with updated data
-        score_data = calculate_customer_score(customer_rec_data)
-
-        # Calculate SKUs sold
-        skus_sold = len(customer_rec_data[customer_rec_data['ActualQuantity'] > 0])
-
-        # Format current visit items with updated quantities
-        current_items = []
-        for _, item_row in customer_rec_data.iterrows():
-            current_items.append({
-                'itemCode': str(item_row['ItemCode']),
-                'itemName': str(item_row['ItemName']),
-                'recommendedQuantity': int(item_row['RecommendedQuantity']),
-                'actualQuantity': int(item_row['ActualQuantity'])
-            })
-
-        # Generate advanced analysis - returns structured JSON
-        analysis_json = llm_analyzer.analyze_customer_performance(
-            customer_code=customer_code,
-            route_code=route_code,
-            date=date,
-            customer_data=customer_rec_data,
-            current_items=current_items,
-            performance_score=score_data['score'],
-            coverage=score_data['coverage'],
-            accuracy=score_data['accuracy']
-        )
-
-        # Return merged response with analysis and metrics
-        return {
-            **analysis_json,
-            "performance_score": score_data['score'],
-            "coverage": score_data['coverage'],
-            "accuracy": score_data['accuracy'],
-            "total_items": len(current_items),
-            "skus_sold": skus_sold,
-            "total_recommended": int(customer_rec_data['RecommendedQuantity'].sum()),
-            "total_actual": int(customer_rec_data['ActualQuantity'].sum())
-        }
+        return _analyze_customer(customer_code, route_code, date, actual_quantities)
 
     except HTTPException as e:
         raise e
     except Exception as e:
-        logger.error(f"Failed to analyze customer performance with updates: {str(e)}")
+        logger.error("Failed to analyze customer performance with updates: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to generate analysis: {str(e)}")
 
 
-@router.post("/analyze-route-with-visited-data")
-async def analyze_route_performance_with_visited_data(request: Dict[str, Any] = Body(...)):
+@router.post("/analyze-customer-with-updates")
+async def analyze_customer_performance_with_updates(request: Dict[str, Any] = Body(...)):
+    """Generate advanced analysis for customer with updated actual quantities"""
+    return ORJSONResponse(await run_in_threadpool(_compute_customer_analysis_with_updates, request))
+
+
+def _compute_route_analysis(request: Dict[str, Any]) -> Dict[str, Any]:
     """Generate advanced analysis for route performance using real visited customer data"""
     try:
         route_code = request.get('route_code')
@@ -651,10 +646,16 @@ async def analyze_route_performance_with_visited_data(request: Dict[str, Any] =
     except HTTPException as e:
         raise e
     except Exception as e:
-        logger.error(f"Failed to analyze route performance with visited data: {str(e)}")
+        logger.error("Failed to analyze route performance with visited data: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to generate route analysis: {str(e)}")
 
 
+@router.post("/analyze-route-with-visited-data")
+async def analyze_route_performance_with_visited_data(request: Dict[str, Any] = Body(...)):
+    """Generate advanced analysis for route performance using real visited customer data"""
+    return ORJSONResponse(await run_in_threadpool(_compute_route_analysis, request))
+
+
 @router.get("/analysis-health")
 async def check_analysis_health():
     """Check analysis service health"""
@@ -662,7 +663,7 @@ async def check_analysis_health():
         health_status = llm_analyzer.health_check()
         return health_status
     except Exception as e:
-        logger.error(f"Failed to check analysis health: {str(e)}")
+        logger.error("Failed to check analysis health: %s", e)
         return {
             "status": "error",
             "error": str(e)
@@ -684,9 +685,6 @@ async def save_supervision_state(request: Request):
     Backend fetches full data from tbl_recommended_orders and builds complete payload
     """
     try:
-        from backend.core.supervision_storage import get_supervision_storage
-        from datetime import datetime
-
         data = await request.json()
 
         route_code = data.get('route_code')
@@ -716,150 +714,145 @@ async def save_supervision_state(request: Request):
             raise HTTPException(status_code=404, detail="No recommendations found for this route and date")
 
         # Get journey plan to count total planned customers
-        journey_df = data_manager.get_journey_plan()
-        journey_filtered = journey_df[
-            (journey_df['RouteCode'].astype(str) == str(route_code)) &
-            (journey_df['JourneyDate'].dt.date == target_date.date())
-        ]
-        total_customers_planned = len(journey_filtered['CustomerCode'].unique()) if not journey_filtered.empty else 0
+        journey_filtered = data_manager.get_journey_for_route_date(route_code, target_date)
+        total_customers_planned = journey_filtered['CustomerCode'].nunique() if not journey_filtered.empty else 0
 
         # Generate unique session ID with microseconds and random suffix
-        import uuid
         timestamp = datetime.now().strftime('%Y%m%d%H%M%S%f')  # Include microseconds
         random_suffix = uuid.uuid4().hex[:8]
         session_id = f"{route_code}_{date_str}_{timestamp}_{random_suffix}"
 
         # Build customer summaries and item details
-        customer_summaries = []
         item_details = []
 
         visited_customer_codes = [vc['customer_code'] for vc in visited_customers]
         visit_sequence_map = {vc['customer_code']: vc['visit_sequence'] for vc in visited_customers}
         llm_analysis_map = {vc['customer_code']: vc.get('llm_analysis', '') for vc in visited_customers}
 
-        route_total_skus_recommended = 0
-        route_total_skus_sold = 0
-        route_total_qty_recommended = 0
-        route_total_qty_actual = 0
-        route_redistribution_count = 0
-        route_redistribution_qty = 0
-        customer_scores = []
-
-        # Pre-group DataFrame by customer for efficient lookup (N+1 optimization)
-        customer_groups = rec_df.groupby('CustomerCode')
+        # Per-customer (code, skus_recommended, skus_sold, qty_recommended, qty_actual)
+        customer_totals = []
+        route_adjustments = []
 
         # Validation: Check if any visited customers don't exist in recommendations
-        invalid_customers = []
-        for customer_code in visited_customer_codes:
-            if customer_code not in customer_groups.groups:
-                invalid_customers.append(customer_code)
+        recommended_customers = set(rec_df['CustomerCode'].unique())
+        invalid_customers = [c for c in visited_customer_codes if c not in recommended_customers]
 
         if invalid_customers:
-            logger.warning(f"Visited customers not found in recommendations: {invalid_customers}")
+            logger.warning("Visited customers not found in recommendations: %s", invalid_customers)
             # Continue saving for valid customers only
-            visited_customer_codes = [c for c in visited_customer_codes if c not in invalid_customers]
+            visited_customer_codes = [c for c in visited_customer_codes if c in recommended_customers]
 
-        for customer_code in visited_customer_codes:
-            customer_data = customer_groups.get_group(customer_code)
+        # Split the visited customers' rows in one groupby pass, ordered by visit so
+        # summaries and items keep the submitted sequence (first visit wins for repeats)
+        visit_order = {}
+        for position, code in enumerate(visited_customer_codes):
+            visit_order.setdefault(code, position)
+        visited_rows = rec_df[rec_df['CustomerCode'].isin(visit_order)]
+        visit_positions = visited_rows['CustomerCode'].map(visit_order).to_numpy()
+        visited_rows = visited_rows.iloc[np.argsort(visit_positions, kind='stable')]
 
-            if customer_data.empty:
-                continue
+        # One save is one submission: every customer and item shares the same timestamp
+        visit_timestamp = datetime.now()
 
+        for customer_code, customer_data in visited_rows.groupby('CustomerCode', sort=False):
             customer_actuals = actual_quantities.get(customer_code, {})
             customer_adjustments = adjustments.get(customer_code, {})
 
-            cust_total_skus_recommended = len(customer_data)
-            cust_total_skus_sold = 0
-            cust_total_qty_recommended = 0
-            cust_total_qty_actual = 0
-
-            visit_timestamp = datetime.now()
-
-            # Process each item
-            for _, item_row in customer_data.iterrows():
-                item_code = str(item_row['ItemCode'])
-
-                original_recommended_qty = int(item_row['RecommendedQuantity'])
-                original_actual_qty = int(item_row.get('ActualQuantity', 0))
-
-                # Get adjustment (from redistribution)
-                adjustment = customer_adjustments.get(item_code, 0)
-                adjusted_recommended_qty = original_recommended_qty + adjustment
-
-                # Get final actual quantity (manual edit or original)
-                final_actual_qty = customer_actuals.get(item_code, original_actual_qty)
-                actual_adjustment = final_actual_qty - original_actual_qty
-
-                was_manually_edited = item_code in customer_actuals
-                was_item_sold = final_actual_qty > 0
-
-                if was_item_sold:
-                    cust_total_skus_sold += 1
-
-                cust_total_qty_recommended += adjusted_recommended_qty
-                cust_total_qty_actual += final_actual_qty
-
-                # Track redistribution
-                if adjustment != 0:
-                    route_redistribution_count += 1
-                    route_redistribution_qty += abs(adjustment)
-
-                # Build item detail record
+            # Pull each column out once as native Python values instead of boxing a Series per row
+            item_codes = customer_data['ItemCode'].astype(str).tolist()
+            item_names = customer_data['ItemName'].astype(str).tolist()
+            original_recommended = customer_data['RecommendedQuantity'].astype('int64').tolist()
+            original_actual = _column_values(customer_data, 'ActualQuantity', 0, 'int64')
+            extra_values = [
+                _column_values(customer_data, column, default, dtype)
+                for column, default, dtype in SAVED_ITEM_FIELDS.values()
+            ]
+
+            # Adjustment (from redistribution) and final actual (manual edit or original) per item
+            item_adjustments = [customer_adjustments.get(code, 0) for code in item_codes]
+            adjusted_recommended = [qty + adj for qty, adj in zip(original_recommended, item_adjustments)]
+            final_actual = [customer_actuals.get(code, qty) for code, qty in zip(item_codes, original_actual)]
+
+            customer_totals.append((
+                customer_code,
+                len(customer_data),
+                sum(qty > 0 for qty in final_actual),
+                sum(adjusted_recommended),
+                sum(final_actual)
+            ))
+
+            # Track redistribution
+            route_adjustments.extend(adj for adj in item_adjustments if adj != 0)
+
+            # Build item detail records
+            for item_code, item_name, orig_rec, adjustment, adj_rec, orig_act, final_act, *extras in zip(
+                item_codes, item_names, original_recommended, item_adjustments,
+                adjusted_recommended, original_actual, final_actual, *extra_values
+            ):
                 item_details.append({
                     'session_id': session_id,
                     'customer_code': customer_code,
                     'item_code': item_code,
-                    'item_name': str(item_row['ItemName']),
-                    'original_recommended_qty': original_recommended_qty,
-                    'adjusted_recommended_qty': adjusted_recommended_qty,
+                    'item_name': item_name,
+                    'original_recommended_qty': orig_rec,
+                    'adjusted_recommended_qty': adj_rec,
                     'recommendation_adjustment': adjustment,
-                    'original_actual_qty': original_actual_qty,
-                    'final_actual_qty': final_actual_qty,
-                    'actual_adjustment': actual_adjustment,
-                    'was_manually_edited': was_manually_edited,
-                    'was_item_sold': was_item_sold,
-                    'recommendation_tier': str(item_row.get('Tier', 'Unknown')),
-                    'priority_score': float(item_row.get('PriorityScore', 0)),
-                    'van_inventory_qty': int(item_row.get('VanLoad', 0)),
-                    'days_since_last_purchase': int(item_row.get('DaysSinceLastPurchase', 0)),
-                    'purchase_cycle_days': float(item_row.get('PurchaseCycleDays', 0)),
-                    'purchase_frequency_pct': float(item_row.get('FrequencyPercent', 0)),
+                    'original_actual_qty': orig_act,
+                    'final_actual_qty': final_act,
+                    'actual_adjustment': final_act - orig_act,
+                    'was_manually_edited': item_code in customer_actuals,
+                    'was_item_sold': final_act > 0,
+                    **dict(zip(SAVED_ITEM_FIELDS, extras)),
                     'visit_timestamp': visit_timestamp
                 })
 
-            # Calculate customer score
-            cust_sku_coverage_rate = (cust_total_skus_sold / cust_total_skus_recommended * 100) if cust_total_skus_recommended > 0 else 0
-            cust_qty_fulfillment_rate = (cust_total_qty_actual / cust_total_qty_recommended * 100) if cust_total_qty_recommended > 0 else 0
-            cust_performance_score = (cust_sku_coverage_rate * 0.4) + (cust_qty_fulfillment_rate * 0.6)
-
-            customer_scores.append(cust_performance_score)
-            route_total_skus_recommended += cust_total_skus_recommended
-            route_total_skus_sold += cust_total_skus_sold
-            route_total_qty_recommended += cust_total_qty_recommended
-            route_total_qty_actual += cust_total_qty_actual
-
-            # Build customer summary
-            customer_summaries.append({
+        # Customer rates and scores as array operations over the per-customer totals
+        totals = np.array([row[1:] for row in customer_totals], dtype=np.int64).reshape(-1, 4)
+        skus_recommended, skus_sold, qty_recommended, qty_actual = totals.T
+        sku_coverage_rates = np.divide(
+            skus_sold, skus_recommended, out=np.zeros(len(totals)), where=skus_recommended > 0
+        ) * 100
+        qty_fulfillment_rates = np.divide(
+            qty_actual, qty_recommended, out=np.zeros(len(totals)), where=qty_recommended > 0
+        ) * 100
+        customer_scores = sku_coverage_rates * 0.4 + qty_fulfillment_rates * 0.6
+
+        # Build customer summaries
+        customer_summaries = [
+            {
                 'session_id': session_id,
                 'customer_code': customer_code,
                 'visit_sequence': visit_sequence_map.get(customer_code, 0),
                 'visit_timestamp': visit_timestamp,
-                'total_skus_recommended': cust_total_skus_recommended,
-                'total_skus_sold': cust_total_skus_sold,
-                'sku_coverage_rate': round(cust_sku_coverage_rate, 2),
-                'total_qty_recommended': cust_total_qty_recommended,
-                'total_qty_actual': cust_total_qty_actual,
-                'qty_fulfillment_rate': round(cust_qty_fulfillment_rate, 2),
-                'customer_performance_score': round(cust_performance_score, 2),
+                'total_skus_recommended': cust_skus_recommended,
+                'total_skus_sold': cust_skus_sold,
+                'sku_coverage_rate': round(coverage_rate, 2),
+                'total_qty_recommended': cust_qty_recommended,
+                'total_qty_actual': cust_qty_actual,
+                'qty_fulfillment_rate': round(fulfillment_rate, 2),
+                'customer_performance_score': round(score, 2),
                 'llm_performance_analysis': llm_analysis_map.get(customer_code, '')
-            })
+            }
+            for (
+                (customer_code, cust_skus_recommended, cust_skus_sold, cust_qty_recommended, cust_qty_actual),
+                coverage_rate, fulfillment_rate, score
+            ) in zip(
+                customer_totals, sku_coverage_rates.tolist(), qty_fulfillment_rates.tolist(), customer_scores.tolist()
+            )
+        ]
+
+        route_total_skus_recommended, route_total_skus_sold, route_total_qty_recommended, route_total_qty_actual = (
+            totals.sum(axis=0).tolist()
+        )
+        route_redistribution_count = len(route_adjustments)
+        route_redistribution_qty = int(np.abs(np.array(route_adjustments, dtype=np.int64)).sum())
 
         # Calculate route-level metrics
         total_customers_visited = len(visited_customers)
         customer_completion_rate = (total_customers_visited / total_customers_planned * 100) if total_customers_planned > 0 else 0
         sku_coverage_rate = (route_total_skus_sold / route_total_skus_recommended * 100) if route_total_skus_recommended > 0 else 0
         qty_fulfillment_rate = (route_total_qty_actual / route_total_qty_recommended * 100) if route_total_qty_recommended > 0 else 0
-        route_performance_score = sum(customer_scores) / len(customer_scores) if customer_scores else 0
+        route_performance_score = float(customer_scores.mean()) if customer_scores.size else 0
 
         # Build route session data
         session_data = {
@@ -892,8 +885,8 @@ async def save_supervision_state(request: Request):
 
         if result['success']:
             logger.info(
-                f"Supervision state saved: {result['session_id']} - "
-                f"{result['customers_saved']} customers, {result['items_saved']} items"
+                "Supervision state saved: %s - %s customers, %s items",
+                result['session_id'], result['customers_saved'], result['items_saved']
             )
 
         return result
@@ -901,7 +894,7 @@ async def save_supervision_state(request: Request):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to save supervision state: {str(e)}", exc_info=True)
+        logger.error("Failed to save supervision state: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to save supervision state: {str(e)}")
 
 
@@ -924,8 +917,6 @@ async def load_supervision_state(request: Request):
     }
     """
     try:
-        from backend.core.supervision_storage import get_supervision_storage
-
         data = await request.json()
         route_code = data.get('route_code')
         date = data.get('date')
@@ -966,27 +957,18 @@ async def load_supervision_state(request: Request):
             sorted(customer_summaries, key=lambda x: x['visit_sequence'])
         ]
 
-        # Build actual quantities map: {customer_code: {item_code: final_actual_qty}}
-        actual_quantities = {}
+        # Build both maps in one pass over the items:
+        # actual quantities {customer_code: {item_code: final_actual_qty}} and
+        # adjustments {customer_code: {item_code: recommendation_adjustment}}
+        actual_quantities = defaultdict(dict)
+        adjustments = defaultdict(dict)
         for item in item_details:
             customer_code = item['customer_code']
             item_code = item['item_code']
-            final_qty = item['final_actual_qty']
-
-            if customer_code not in actual_quantities:
-                actual_quantities[customer_code] = {}
-            actual_quantities[customer_code][item_code] = final_qty
+            actual_quantities[customer_code][item_code] = item['final_actual_qty']
 
-        # Build adjustments map: {customer_code: {item_code: recommendation_adjustment}}
-        adjustments = {}
-        for item in item_details:
-            customer_code = item['customer_code']
-            item_code = item['item_code']
             adjustment = item['recommendation_adjustment']
-
             if adjustment != 0:  # Only include non-zero adjustments
-                if customer_code not in adjustments:
-                    adjustments[customer_code] = {}
                 adjustments[customer_code][item_code] = adjustment
 
         # Build customer analyses map: {customer_code: llm_analysis_text}
@@ -1002,7 +984,7 @@ async def load_supervision_state(request: Request):
             for c in customer_summaries
         }
 
-        logger.info(f"Loaded saved supervision session: {session_id} ({len(visited_customers)} customers)")
+        logger.info("Loaded saved supervision session: %s (%s customers)", session_id, len(visited_customers))
 
         return {
             'exists': True,
@@ -1036,7 +1018,7 @@ async def load_supervision_state(request: Request):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to load supervision state: {str(e)}", exc_info=True)
+        logger.error("Failed to load supervision state: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to load supervision state: {str(e)}")
 
 
@@ -1050,8 +1032,6 @@ async def check_supervision_exists(route_code: str, date: str):
     - None if not found
     """
     try:
-        from backend.core.supervision_storage import get_supervision_storage
-
         storage = get_supervision_storage()
         session_id = storage.check_session_exists(route_code, date)
 
@@ -1061,7 +1041,7 @@ async def check_supervision_exists(route_code: str, date: str):
         }
 
     except Exception as e:
-        logger.error(f"Failed to check supervision existence: {str(e)}")
+        logger.error("Failed to check supervision existence: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to check supervision: {str(e)}")
 
 
@@ -1077,8 +1057,6 @@ async def get_llm_cache_stats():
     - Total cached responses
     """
     try:
-        from backend.core.llm_cache import get_llm_cache, get_rate_limiter
-
         cache = get_llm_cache()
         rate_limiter = get_rate_limiter()
 
@@ -1104,7 +1082,7 @@ async def get_llm_cache_stats():
         }
 
     except Exception as e:
-        logger.error(f"Failed to get LLM cache stats: {e}")
+        logger.error("Failed to get LLM cache stats: %s", e)
         return {
             'cache': None,
             'rate_limiter': None,
@@ -59,6 +59,11 @@ CREATE NONCLUSTERED INDEX idx_staged_date_route
     INCLUDE (customer_code, item_code);
 GO
 
+CREATE NONCLUSTERED INDEX idx_staged_date_route_customer
+    ON [dbo].[tbl_staged_recommended_orders] (trx_date, route_code, customer_code)
+    INCLUDE (item_code, item_name, recommended_quantity, tier, priority_score);
+GO
+
 CREATE NONCLUSTERED INDEX idx_staged_customer
     ON [dbo].[tbl_staged_recommended_orders] (customer_code, trx_date);
 GO
@@ -41,49 +41,49 @@ def create_staged_recommended_orders_table():
         'is_active': [1]
     })
 
+    # Created together in one batch (one round trip); names are listed for the log output
+    index_statements = {
+        'idx_staged_date_route': """
+            CREATE NONCLUSTERED INDEX idx_staged_date_route
+            ON [dbo].[tbl_staged_recommended_orders] (trx_date, route_code)
+            INCLUDE (customer_code, item_code)
+        """,
+        'idx_staged_date_route_customer': """
+            CREATE NONCLUSTERED INDEX idx_staged_date_route_customer
+            ON [dbo].[tbl_staged_recommended_orders] (trx_date, route_code, customer_code)
+            INCLUDE (item_code, item_name, recommended_quantity, tier, priority_score)
+        """,
+        'idx_staged_customer': """
+            CREATE NONCLUSTERED INDEX idx_staged_customer
+            ON [dbo].[tbl_staged_recommended_orders] (customer_code, trx_date)
+        """,
+        'idx_staged_item': """
+            CREATE NONCLUSTERED INDEX idx_staged_item
+            ON [dbo].[tbl_staged_recommended_orders] (item_code, trx_date)
+        """,
+        'idx_staged_generated_at': """
+            CREATE NONCLUSTERED INDEX idx_staged_generated_at
+            ON [dbo].[tbl_staged_recommended_orders] (generated_at DESC)
+        """
+    }
+
     try:
-        # Create table with sample row (to establish schema)
+        # Create table with sample row (to establish schema) and delete the sample row
+        # in a single transaction (keep empty table)
         print("Creating STAGED table tbl_staged_recommended_orders...")
-        sample_df.to_sql('tbl_staged_recommended_orders', engine, if_exists='replace', index=False)
+        with engine.begin() as conn:
+            sample_df.to_sql('tbl_staged_recommended_orders', conn, if_exists='replace', index=False)
+            conn.exec_driver_sql("DELETE FROM [dbo].[tbl_staged_recommended_orders] WHERE customer_code = 'SAMPLE'")
         print("✅ STAGED Table created successfully!")
-
-        # Delete the sample row (keep empty table)
-        with engine.connect() as conn:
-            conn.execute("DELETE FROM [dbo].[tbl_staged_recommended_orders] WHERE customer_code = 'SAMPLE'")
-            conn.commit()
-            print("✅ Sample data removed. Table is ready!")
+        print("✅ Sample data removed. Table is ready!")
 
         # Try to create indexes (may fail without permissions, but table will work)
         try:
-            with engine.connect() as conn:
+            with engine.begin() as conn:
                 print("\nCreating indexes...")
-
-                conn.execute("""
-                    CREATE NONCLUSTERED INDEX idx_staged_date_route
-                    ON [dbo].[tbl_staged_recommended_orders] (trx_date, route_code)
-                    INCLUDE (customer_code, item_code)
-                """)
-                print("✅ Index idx_staged_date_route created")
-
-                conn.execute("""
-                    CREATE NONCLUSTERED INDEX idx_staged_customer
-                    ON [dbo].[tbl_staged_recommended_orders] (customer_code, trx_date)
-                """)
-                print("✅ Index idx_staged_customer created")
-
-                conn.execute("""
-                    CREATE NONCLUSTERED INDEX idx_staged_item
-                    ON [dbo].[tbl_staged_recommended_orders] (item_code, trx_date)
-                """)
-                print("✅ Index idx_staged_item created")
-
-                conn.execute("""
-                    CREATE NONCLUSTERED INDEX idx_staged_generated_at
-                    ON [dbo].[tbl_staged_recommended_orders] (generated_at DESC)
-                """)
-                print("✅ Index idx_staged_generated_at created")
-
-                conn.commit()
+                conn.exec_driver_sql(";\n".join(index_statements.values()))
+                for index_name in index_statements:
+                    print(f"✅ Index {index_name} created")
                 print("\n✅ All indexes created successfully!")
 
         except Exception as e:
@@ -0,0 +1,8 @@
+"""
+Shared pytest setup: make the repository root importable so tests can use backend.* imports
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
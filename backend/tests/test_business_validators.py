@@ -0,0 +1,90 @@
+"""
+Tests for the route/customer/item code validators
+"""
+
+import pandas as pd
+import pytest
+
+from backend.exceptions import (
+    ValidationException, RouteNotFoundException, CustomerNotFoundException, ItemNotFoundException
+)
+from backend.validators import (
+    validate_route_code, validate_customer_code, validate_item_code,
+    validate_route_codes, validate_customer_codes, validate_item_codes,
+    build_validation_index, make_route_validator, make_customer_validator, make_item_validator
+)
+
+VALIDATORS = [
+    ('RouteCode', validate_route_code, validate_route_codes, make_route_validator, RouteNotFoundException),
+    ('CustomerCode', validate_customer_code, validate_customer_codes, make_customer_validator, CustomerNotFoundException),
+    ('ItemCode', validate_item_code, validate_item_codes, make_item_validator, ItemNotFoundException),
+]
+
+CODES = [' 1004 ', 1005, 'All', ' All ', 'A#ll', '10#04', '', '   ', None, 0, '9999']
+
+
+def _reference_frames(column):
+    frame = pd.DataFrame({column: [1004, 1005]})
+    return {
+        'frame': frame,
+        'index': build_validation_index(frame, column),
+        'empty_frame': pd.DataFrame(),
+        'empty_index': frozenset(),
+        'none': None,
+    }
+
+
+def _outcome(validate, *args):
+    try:
+        return validate(*args)
+    except (ValidationException, RouteNotFoundException, CustomerNotFoundException, ItemNotFoundException) as e:
+        return type(e)
+
+
+@pytest.mark.parametrize("column, validate_one, validate_many, make_validator, not_found", VALIDATORS)
+@pytest.mark.parametrize("reference_name", ['frame', 'index', 'empty_frame', 'empty_index', 'none'])
+def test_factory_matches_scalar_validator(column, validate_one, validate_many, make_validator, not_found, reference_name):
+    reference = _reference_frames(column)[reference_name]
+    validate = make_validator(reference)
+
+    for code in CODES:
+        assert _outcome(validate, code) == _outcome(validate_one, code, reference), code
+
+
+@pytest.mark.parametrize("column, validate_one, validate_many, make_validator, not_found", VALIDATORS)
+@pytest.mark.parametrize("reference_name", ['frame', 'index', 'empty_frame', 'empty_index', 'none'])
+def test_batch_matches_scalar_validator(column, validate_one, validate_many, make_validator, not_found, reference_name):
+    reference = _reference_frames(column)[reference_name]
+    valid_codes = [' 1004 ', 1005, 'All', ' All ', 'A#ll', '10#04']
+
+    assert validate_many(valid_codes, reference) == [validate_one(code, reference) for code in valid_codes]
+    assert validate_many([], reference) == []
+
+
+@pytest.mark.parametrize("column, validate_one, validate_many, make_validator, not_found", VALIDATORS)
+def test_batch_rejects_empty_codes(column, validate_one, validate_many, make_validator, not_found):
+    for empty in ['', '   ', None, 0]:
+        with pytest.raises(ValidationException):
+            validate_many(['1004', empty], _reference_frames(column)['frame'])
+
+
+@pytest.mark.parametrize("column, validate_one, validate_many, make_validator, not_found", VALIDATORS)
+@pytest.mark.parametrize("reference_name", ['frame', 'index'])
+def test_missing_codes_raise_not_found(column, validate_one, validate_many, make_validator, not_found, reference_name):
+    reference = _reference_frames(column)[reference_name]
+
+    with pytest.raises(not_found):
+        validate_one('9999', reference)
+    with pytest.raises(not_found):
+        make_validator(reference)('9999')
+    with pytest.raises(not_found, match='9999, 8888'):
+        validate_many(['1004', '9999', '8888', '9999'], reference)
+
+
+def test_reference_rows_appended_in_place_are_seen():
+    routes = pd.DataFrame({'RouteCode': ['1004']})
+    assert validate_route_code('1004', routes) == '1004'
+
+    routes.loc[len(routes)] = ['1005']
+
+    assert validate_route_code('1005', routes) == '1005'
@@ -0,0 +1,40 @@
+"""
+Tests for the sales supervision item accuracy scoring
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from backend.routes.sales_supervision import calculate_item_accuracy, calculate_item_accuracy_array
+
+
+@pytest.mark.parametrize("actual, recommended, expected", [
+    (10, 10, 100.0),     # inside the 75-120% perfect zone
+    (75, 100, 100.0),    # lower edge of the perfect zone
+    (120, 100, 100.0),   # upper edge of the perfect zone
+    (50, 100, 50 / 75 * 100),
+    (160, 100, 50.0),
+    (200, 100, 0.0),
+    (300, 100, 0.0),
+    (0, 0, 100.0),
+    (3, 0, 0.0),
+])
+def test_item_accuracy_piecewise(actual, recommended, expected):
+    assert calculate_item_accuracy(actual, recommended) == pytest.approx(expected)
+
+
+def test_item_accuracy_missing_actual_scores_zero():
+    assert calculate_item_accuracy(float('nan'), 10) == 0.0
+    assert calculate_item_accuracy(float('nan'), 0) == 0.0
+
+
+def test_item_accuracy_array_matches_scalar():
+    actual = np.array([10, 75, 120, 50, 160, 200, 300, 0, 3, np.nan, np.nan], dtype=np.float64)
+    recommended = np.array([10, 100, 100, 100, 100, 100, 100, 0, 0, 10, 0], dtype=np.float64)
+
+    expected = [calculate_item_accuracy(a, r) for a, r in zip(actual, recommended)]
+
+    assert calculate_item_accuracy_array(actual, recommended).tolist() == pytest.approx(expected)
+    assert not any(math.isnan(value) for value in expected)
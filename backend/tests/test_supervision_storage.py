@@ -0,0 +1,88 @@
+"""
+Tests for supervision session persistence parameter binding
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+
+from backend.core.supervision_storage import SupervisionStorage
+
+
+class FakeCursor:
+    """Records the statements and parameters sent to the database"""
+
+    def __init__(self):
+        self.fast_executemany = False
+        self.executed = []
+        self.executemany_calls = []
+
+    def execute(self, sql, params=()):
+        self.executed.append((sql, params))
+
+    def executemany(self, sql, rows):
+        self.executemany_calls.append((sql, list(rows), self.fast_executemany))
+
+
+class FakeConnection:
+    def __init__(self):
+        self.cursor_obj = FakeCursor()
+        self.committed = False
+
+    def cursor(self):
+        return self.cursor_obj
+
+    def commit(self):
+        self.committed = True
+
+
+class FakeDatabaseManager:
+    def __init__(self):
+        self.connection = FakeConnection()
+
+    @contextmanager
+    def get_connection(self):
+        yield self.connection
+
+
+VISIT_TIMESTAMP = datetime(2025, 10, 7, 9, 30, 15, 123456)
+
+
+def _session():
+    session_data = {
+        'session_id': 'S1', 'route_code': '1004', 'supervision_date': '2025-10-07',
+        'total_customers_planned': 1, 'total_customers_visited': 1, 'customer_completion_rate': 100.0,
+        'total_skus_recommended': 1, 'total_skus_sold': 1, 'sku_coverage_rate': 100.0,
+        'total_qty_recommended': 5, 'total_qty_actual': 5, 'qty_fulfillment_rate': 100.0,
+        'redistribution_count': 0, 'redistribution_qty': 0, 'route_performance_score': 100.0
+    }
+    customer_summaries = [{
+        'session_id': 'S1', 'customer_code': 'C1', 'visit_sequence': 1, 'visit_timestamp': VISIT_TIMESTAMP,
+        'total_skus_recommended': 1, 'total_skus_sold': 1, 'sku_coverage_rate': 100.0,
+        'total_qty_recommended': 5, 'total_qty_actual': 5, 'qty_fulfillment_rate': 100.0,
+        'customer_performance_score': 100.0
+    }]
+    item_details = [{
+        'session_id': 'S1', 'customer_code': 'C1', 'item_code': 'I1', 'item_name': 'Item 1',
+        'original_recommended_qty': 5, 'adjusted_recommended_qty': 5, 'recommendation_adjustment': 0,
+        'original_actual_qty': 5, 'final_actual_qty': 5, 'actual_adjustment': 0,
+        'was_manually_edited': False, 'was_item_sold': True,
+        'recommendation_tier': 'A', 'priority_score': 90.0, 'van_inventory_qty': 10,
+        'days_since_last_purchase': 3, 'purchase_cycle_days': 7.0, 'purchase_frequency_pct': 50.0,
+        'visit_timestamp': VISIT_TIMESTAMP
+    }]
+    return session_data, customer_summaries, item_details
+
+
+def test_item_visit_timestamp_bound_with_millisecond_precision():
+    storage = SupervisionStorage()
+    storage.db_manager = FakeDatabaseManager()
+
+    result = storage.save_supervision_session(*_session())
+
+    assert result['success'] is True
+    [(_, rows, fast_executemany)] = storage.db_manager.connection.cursor_obj.executemany_calls
+    assert fast_executemany is True
+
+    bound_timestamp = rows[0][-1]
+    assert bound_timestamp == datetime(2025, 10, 7, 9, 30, 15, 123000)
+    assert bound_timestamp.microsecond % 1000 == 0
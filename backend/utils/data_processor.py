@@ -1,81 +1,90 @@
 import pandas as pd
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Dict, Any
 import io
 
+def _read_trx_csv(file_content: bytes) -> pd.DataFrame:
+    """Read CSV content with TrxDate parsed by the CSV reader's ISO fast path"""
+    df = pd.read_csv(io.BytesIO(file_content), parse_dates=['TrxDate'], date_format='ISO8601')
+    # read_csv leaves unparseable dates as strings; convert here so bad input still raises
+    if not pd.api.types.is_datetime64_any_dtype(df['TrxDate']):
+        df['TrxDate'] = pd.to_datetime(df['TrxDate'])
+    return df
+
 def parse_dashboard_csv(file_content: bytes) -> pd.DataFrame:
     """Parse dashboard CSV content into DataFrame"""
     try:
-        df = pd.read_csv(io.BytesIO(file_content))
-        df['TrxDate'] = pd.to_datetime(df['TrxDate'])
-        return df
+        return _read_trx_csv(file_content)
     except Exception as e:
         raise ValueError(f"Error parsing CSV: {str(e)}")
 
 def parse_forecast_csv(file_content: bytes) -> pd.DataFrame:
     """Parse forecast CSV content into DataFrame"""
     try:
-        df = pd.read_csv(io.BytesIO(file_content))
-        df['TrxDate'] = pd.to_datetime(df['TrxDate'])
-        return df
+        return _read_trx_csv(file_content)
     except Exception as e:
         raise ValueError(f"Error parsing CSV: {str(e)}")
 
+@lru_cache(maxsize=128)
+def _parse_date_bound(value: str) -> pd.Timestamp:
+    """Parse a filter date bound; requests reuse a handful of date ranges"""
+    return pd.to_datetime(value)
+
 def filter_dashboard_data(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
     """Apply filters to dashboard data - supports multi-select for routes and items"""
-    filtered_df = df.copy()
+    # Filter by date range; every filter is combined into one mask so the frame is gathered once
+    start_date = _parse_date_bound(filters['start_date'])
+    end_date = _parse_date_bound(filters['end_date'])
+    trx_dates = df['TrxDate']
+    # copy=True: copy-on-write pandas hands out read-only views, and the mask is updated in place
+    mask = ((trx_dates >= start_date) & (trx_dates <= end_date)).to_numpy(copy=True)
 
     # Filter by routes - support multi-select
     route_codes = filters.get('route_codes', [])
     if route_codes and 'All' not in route_codes:
         # Convert to int for comparison since RouteCode is stored as int
         route_codes_int = [int(rc) for rc in route_codes]
-        filtered_df = filtered_df[filtered_df['RouteCode'].isin(route_codes_int)]
+        mask &= df['RouteCode'].isin(route_codes_int).to_numpy()
 
     # Filter by items - support multi-select
     item_codes = filters.get('item_codes', ['All'])
     if item_codes and 'All' not in item_codes:
-        filtered_df = filtered_df[filtered_df['ItemCode'].isin(item_codes)]
-
-    # Filter by date range
-    start_date = pd.to_datetime(filters['start_date'])
-    end_date = pd.to_datetime(filters['end_date'])
-    filtered_df = filtered_df[(filtered_df['TrxDate'] >= start_date) & (filtered_df['TrxDate'] <= end_date)]
+        mask &= df['ItemCode'].isin(item_codes).to_numpy()
 
-    return filtered_df
+    return df[mask]
 
 def aggregate_by_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
     """Aggregate data by ISO calendar period (Daily, Weekly, Monthly)"""
     if period == 'Daily':
         return df
     
-    df_copy = df.copy()
-    df_copy['TrxDate'] = pd.to_datetime(df_copy['TrxDate'])
-    
-    # Initialize group_cols to avoid undefined variable error
-    group_cols = []
+    # Period keys are derived Series grouped alongside the frame, so the input is never copied
+    trx_date = pd.to_datetime(df['TrxDate'])
+    iso_calendar = trx_date.dt.isocalendar()
     
     if period == 'Weekly':
-        # Use ISO calendar weeks
-        df_copy['ISOYear'] = df_copy['TrxDate'].dt.isocalendar().year
-        df_copy['ISOWeek'] = df_copy['TrxDate'].dt.isocalendar().week
-        
-        # Create period identifier - use Monday of the ISO week as period date
-        df_copy['Period'] = df_copy['TrxDate'] - pd.to_timedelta(df_copy['TrxDate'].dt.dayofweek, unit='d')
-        group_cols = ['Period', 'ISOYear', 'ISOWeek', 'RouteCode', 'ItemCode', 'ItemName']
+        # Use ISO calendar weeks; period identifier is the Monday of the ISO week
+        period_keys = {
+            'Period': trx_date - pd.to_timedelta(trx_date.dt.dayofweek, unit='d'),
+            'ISOYear': iso_calendar['year'],
+            'ISOWeek': iso_calendar['week']
+        }
         
     elif period == 'Monthly':
-        # Use ISO calendar year with regular months
-        df_copy['ISOYear'] = df_copy['TrxDate'].dt.isocalendar().year
-        df_copy['Month'] = df_copy['TrxDate'].dt.month
-        
-        # Create period identifier - use first day of month
-        df_copy['Period'] = df_copy['TrxDate'].dt.to_period('M').dt.to_timestamp()
-        group_cols = ['Period', 'ISOYear', 'Month', 'RouteCode', 'ItemCode', 'ItemName']
+        # Use ISO calendar year with regular months; period identifier is the first day of month
+        period_keys = {
+            'Period': trx_date.dt.to_period('M').dt.to_timestamp(),
+            'ISOYear': iso_calendar['year'],
+            'Month': trx_date.dt.month
+        }
     else:
         # Fallback for unknown period types
         return df
     
+    group_keys = [key.rename(name) for name, key in period_keys.items()]
+    group_keys += [df['RouteCode'], df['ItemCode'], df['ItemName']]
+    
     # Group and aggregate - remove old average columns since we calculate dynamically
     agg_dict = {
         'TotalQuantity': 'sum',
@@ -86,7 +95,7 @@ def aggregate_by_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
         'AvgUnitPrice': 'mean'
     }
     
-    aggregated = df_copy.groupby(group_cols).agg(agg_dict).reset_index()
+    aggregated = df.groupby(group_keys).agg(agg_dict).reset_index()
     aggregated['TrxDate'] = aggregated['Period']
     
     return aggregated
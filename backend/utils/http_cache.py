@@ -4,10 +4,20 @@ Provides clean, reusable caching headers for API responses
 """
 
 import hashlib
-import json
-from typing import Any, Dict, Optional
+import threading
+import orjson
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
 from fastapi import Response
-from fastapi.responses import JSONResponse
+from backend.constants.config_constants import HTTP_RESPONSE_CACHE_MAX_ENTRIES
+
+# No key sorting: payloads are built in a fixed insertion order, so equal data
+# always serializes (and hashes) to the same bytes
+BODY_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# LRU of encoded responses: (cache_type, cache_key) -> (etag, body)
+_encoded_responses: "OrderedDict[Tuple, Tuple[str, bytes]]" = OrderedDict()
+_encoded_responses_lock = threading.Lock()
 
 
 def generate_etag(data: Any) -> str:
@@ -20,16 +30,31 @@ def generate_etag(data: Any) -> str:
     Returns:
         ETag hash string
     """
-    content = json.dumps(data, sort_keys=True, default=str)
-    return hashlib.md5(content.encode()).hexdigest()
+    # Same bytes as the response body, so this matches the ETag sent by create_cached_response
+    return encode_response(data)[0]
+
+
+def encode_response(data: Any) -> Tuple[str, bytes]:
+    """
+    Serialize response data once and derive its ETag from the same bytes
+
+    Args:
+        data: Response data (dict, list, or any JSON-serializable object)
+
+    Returns:
+        Tuple of (etag, JSON body bytes)
+    """
+    body = orjson.dumps(data, default=str, option=BODY_DUMPS_OPTIONS)
+    return hashlib.md5(body).hexdigest(), body
 
 
 def create_cached_response(
     data: Dict[str, Any],
     max_age: int = 3600,
     stale_while_revalidate: Optional[int] = None,
-    must_revalidate: bool = False
-) -> JSONResponse:
+    must_revalidate: bool = False,
+    encoded: Optional[Tuple[str, bytes]] = None
+) -> Response:
     """
     Create JSON response with appropriate cache headers
 
@@ -38,11 +63,12 @@ def create_cached_response(
         max_age: Cache duration in seconds (default: 1 hour)
         stale_while_revalidate: Allow stale content while revalidating (seconds)
         must_revalidate: Force revalidation after expiry
+        encoded: Pre-computed (etag, body) for data; encoded here when omitted
 
     Returns:
-        JSONResponse with cache headers
+        JSON response with cache headers
     """
-    etag = generate_etag(data)
+    etag, body = encoded if encoded is not None else encode_response(data)
 
     # Build Cache-Control header
     cache_parts = [f"public, max-age={max_age}"]
@@ -55,8 +81,9 @@ def create_cached_response(
 
     cache_control = ", ".join(cache_parts)
 
-    return JSONResponse(
-        content=data,
+    return Response(
+        content=body,
+        media_type="application/json",
         headers={
             "Cache-Control": cache_control,
             "ETag": f'"{etag}"',
@@ -87,18 +114,43 @@ CACHE_CONFIGS = {
 
 
 def cached_response(
-    data: Dict[str, Any],
-    cache_type: str = "filter_options"
-) -> JSONResponse:
+    data: Union[Dict[str, Any], Callable[[], Dict[str, Any]]],
+    cache_type: str = "filter_options",
+    cache_key: Optional[Hashable] = None
+) -> Response:
     """
     Convenience function to create cached response with predefined config
 
     Args:
-        data: Response data
+        data: Response data, or a zero-argument callable building it (only
+            called when cache_key misses)
         cache_type: Type of cache config to use (from CACHE_CONFIGS)
+        cache_key: Hashable key identifying the payload, including a data
+            version (e.g. the data refresh time); when given, the encoded
+            body and ETag are reused until the key changes
 
     Returns:
-        JSONResponse with appropriate cache headers
+        JSON response with appropriate cache headers
     """
     config = CACHE_CONFIGS.get(cache_type, CACHE_CONFIGS["no_cache"])
-    return create_cached_response(data, **config)
+
+    if cache_key is None:
+        payload = data() if callable(data) else data
+        return create_cached_response(payload, **config)
+
+    key = (cache_type, cache_key)
+    with _encoded_responses_lock:
+        encoded = _encoded_responses.get(key)
+        if encoded is not None:
+            _encoded_responses.move_to_end(key)
+
+    if encoded is None:
+        payload = data() if callable(data) else data
+        encoded = encode_response(payload)
+        with _encoded_responses_lock:
+            _encoded_responses[key] = encoded
+            _encoded_responses.move_to_end(key)
+            while len(_encoded_responses) > HTTP_RESPONSE_CACHE_MAX_ENTRIES:
+                _encoded_responses.popitem(last=False)
+
+    return create_cached_response(None, encoded=encoded, **config)
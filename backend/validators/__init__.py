@@ -4,7 +4,11 @@ Validation utilities
 
 from .date_validator import validate_date, parse_date, validate_date_range
 from .input_sanitizer import sanitize_string, sanitize_code, sanitize_dict
-from .business_validators import validate_route_code, validate_customer_code, validate_item_code
+from .business_validators import (
+    validate_route_code, validate_customer_code, validate_item_code,
+    validate_route_codes, validate_customer_codes, validate_item_codes,
+    build_validation_index, make_route_validator, make_customer_validator, make_item_validator
+)
 
 __all__ = [
     'validate_date',
@@ -16,4 +20,11 @@ __all__ = [
     'validate_route_code',
     'validate_customer_code',
     'validate_item_code',
+    'validate_route_codes',
+    'validate_customer_codes',
+    'validate_item_codes',
+    'build_validation_index',
+    'make_route_validator',
+    'make_customer_validator',
+    'make_item_validator',
 ]
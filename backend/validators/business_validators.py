@@ -1,96 +1,395 @@
 """
 Business logic validators
+
+Reference DataFrames passed to the code validators are treated as read-only
+snapshots: their codes are cached per DataFrame object. Callers whose reference
+data changes in place should pass a fresh build_validation_index set instead.
 """
 
-from typing import List, Union
+import weakref
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Type, Union
+import numpy as np
 import pandas as pd
+from pandas.api.types import infer_dtype
 
 from backend.exceptions import ValidationException, RouteNotFoundException, CustomerNotFoundException, ItemNotFoundException
-from .input_sanitizer import sanitize_code
+from .input_sanitizer import _filter_code
+
+# Reference codes: a DataFrame with the code column, or a set from build_validation_index
+ReferenceCodes = Union[pd.DataFrame, FrozenSet[str]]
+
+# (id(df), column) -> (weak reference to df, row count when built, set of codes as strings)
+_code_sets: Dict[Tuple[int, str], Tuple[weakref.ref, int, FrozenSet[str]]] = {}
+
+
+def _string_values(values: pd.Series) -> np.ndarray:
+    """
+    Get column values as strings, like astype(str)
+
+    Columns that already hold only strings (object or string dtype, no missing
+    values) are returned without building a converted copy.
+
+    Args:
+        values: Column to read
+
+    Returns:
+        Object array of the values
+    """
+    if infer_dtype(values, skipna=False) == 'string' and not values.hasnans:
+        return values.to_numpy(dtype=object, copy=False)
+    return values.astype(str).to_numpy(dtype=object)
+
+
+def _code_set(df: pd.DataFrame, column: str) -> FrozenSet[str]:
+    """
+    Get the codes of a reference DataFrame column as a set of strings
+
+    Built once per DataFrame object and reused for hashed membership checks;
+    entries are dropped when the DataFrame is garbage collected. Rows appended or
+    removed in place trigger a rebuild, but edits to existing values are not
+    detected, so reference frames must not be modified in place.
+
+    Args:
+        df: Reference DataFrame
+        column: Code column name
+
+    Returns:
+        Frozen set of codes converted to strings
+    """
+    key = (id(df), column)
+    cached = _code_sets.get(key)
+    if cached is not None and cached[0]() is df and cached[1] == len(df):
+        return cached[2]
+
+    codes = frozenset(_string_values(df[column]))
+    _code_sets[key] = (weakref.ref(df, lambda _, key=key: _code_sets.pop(key, None)), len(df), codes)
+    return codes
+
+
+def build_validation_index(df: pd.DataFrame, column: str) -> FrozenSet[str]:
+    """
+    Build a set of reference codes once, to pass to the validators in place of the DataFrame
+
+    The set is a snapshot: rebuild it after the reference data changes.
+
+    Args:
+        df: Reference DataFrame
+        column: Code column name (e.g. 'RouteCode')
+
+    Returns:
+        Frozen set of codes converted to strings
+    """
+    return _code_set(df, column)
+
+
+def _reference_codes(available: Optional[ReferenceCodes], column: str) -> Optional[FrozenSet[str]]:
+    """
+    Resolve reference codes to a set, or None when there is nothing to check against
+
+    Args:
+        available: Reference DataFrame or prebuilt code set (optional)
+        column: Code column name, used for DataFrames
+
+    Returns:
+        Frozen set of codes, or None if available is missing or empty
+    """
+    if isinstance(available, frozenset):
+        return available or None
+    if available is None or available.empty:
+        return None
+    return _code_set(available, column)
+
+
+def _normalize_code(code: Union[str, int], label: str) -> str:
+    """
+    Reject empty codes and return the code as a stripped string
+
+    Args:
+        code: Code value to check
+        label: Code name used in the error message
+
+    Returns:
+        Stripped code string
+
+    Raises:
+        ValidationException: If the code is empty
+    """
+    if isinstance(code, str):
+        code_str = code.strip()
+        if not code_str:
+            raise ValidationException(f"{label} code cannot be empty")
+        return code_str
+
+    if not code:
+        raise ValidationException(f"{label} code cannot be empty")
+    return str(code).strip()
 
 
-def validate_route_code(route_code: Union[str, int], available_routes: pd.DataFrame = None) -> str:
+def validate_route_code(route_code: Union[str, int], available_routes: ReferenceCodes = None) -> str:
     """
     Validate route code
 
     Args:
         route_code: Route code to validate
-        available_routes: DataFrame of available routes (optional)
+        available_routes: DataFrame or validation index of available routes (optional)
 
     Returns:
-        Validated and sanitized route code
+        Validated and sanitized route code ('All' is returned as is)
 
     Raises:
         ValidationException: If route code is invalid
         RouteNotFoundException: If route not found in available routes
     """
-    if not route_code or (isinstance(route_code, str) and route_code.strip() == ''):
-        raise ValidationException("Route code cannot be empty")
+    code_str = _normalize_code(route_code, 'Route')
+
+    # The 'All' sentinel needs neither sanitizing nor a lookup
+    if code_str == 'All':
+        return 'All'
 
     # Sanitize
-    clean_code = sanitize_code(route_code)
+    clean_code = _filter_code(code_str)
 
     # Check if exists in available routes
-    if available_routes is not None and not available_routes.empty:
-        if clean_code != 'All' and clean_code not in available_routes['RouteCode'].astype(str).values:
+    reference = _reference_codes(available_routes, 'RouteCode')
+    if reference is not None:
+        if clean_code != 'All' and clean_code not in reference:
             raise RouteNotFoundException(clean_code)
 
     return clean_code
 
 
-def validate_customer_code(customer_code: Union[str, int], available_customers: pd.DataFrame = None) -> str:
+def validate_customer_code(customer_code: Union[str, int], available_customers: ReferenceCodes = None) -> str:
     """
     Validate customer code
 
     Args:
         customer_code: Customer code to validate
-        available_customers: DataFrame of available customers (optional)
+        available_customers: DataFrame or validation index of available customers (optional)
 
     Returns:
-        Validated and sanitized customer code
+        Validated and sanitized customer code ('All' is returned as is)
 
     Raises:
         ValidationException: If customer code is invalid
         CustomerNotFoundException: If customer not found in available customers
     """
-    if not customer_code or (isinstance(customer_code, str) and customer_code.strip() == ''):
-        raise ValidationException("Customer code cannot be empty")
+    code_str = _normalize_code(customer_code, 'Customer')
+
+    # The 'All' sentinel needs neither sanitizing nor a lookup
+    if code_str == 'All':
+        return 'All'
 
     # Sanitize
-    clean_code = sanitize_code(customer_code)
+    clean_code = _filter_code(code_str)
 
     # Check if exists in available customers
-    if available_customers is not None and not available_customers.empty:
-        if clean_code != 'All' and clean_code not in available_customers['CustomerCode'].astype(str).values:
+    reference = _reference_codes(available_customers, 'CustomerCode')
+    if reference is not None:
+        if clean_code != 'All' and clean_code not in reference:
             raise CustomerNotFoundException(clean_code)
 
     return clean_code
 
 
-def validate_item_code(item_code: Union[str, int], available_items: pd.DataFrame = None) -> str:
+def validate_item_code(item_code: Union[str, int], available_items: ReferenceCodes = None) -> str:
     """
     Validate item code
 
     Args:
         item_code: Item code to validate
-        available_items: DataFrame of available items (optional)
+        available_items: DataFrame or validation index of available items (optional)
 
     Returns:
-        Validated and sanitized item code
+        Validated and sanitized item code ('All' is returned as is)
 
     Raises:
         ValidationException: If item code is invalid
         ItemNotFoundException: If item not found in available items
     """
-    if not item_code or (isinstance(item_code, str) and item_code.strip() == ''):
-        raise ValidationException("Item code cannot be empty")
+    code_str = _normalize_code(item_code, 'Item')
+
+    # The 'All' sentinel needs neither sanitizing nor a lookup
+    if code_str == 'All':
+        return 'All'
 
     # Sanitize
-    clean_code = sanitize_code(item_code)
+    clean_code = _filter_code(code_str)
 
     # Check if exists in available items
-    if available_items is not None and not available_items.empty:
-        if clean_code != 'All' and clean_code not in available_items['ItemCode'].astype(str).values:
+    reference = _reference_codes(available_items, 'ItemCode')
+    if reference is not None:
+        if clean_code != 'All' and clean_code not in reference:
             raise ItemNotFoundException(clean_code)
 
     return clean_code
+
+
+def _validate_codes(
+    codes: Iterable[Union[str, int]],
+    available: Optional[ReferenceCodes],
+    column: str,
+    label: str,
+    not_found: Type[Exception]
+) -> List[str]:
+    """
+    Sanitize and validate many codes in one pass
+
+    Args:
+        codes: Code values to validate
+        available: Reference DataFrame or validation index (optional)
+        column: Code column in the reference DataFrame
+        label: Code name used in the empty-code error message
+        not_found: Exception raised with the codes missing from the reference
+
+    Returns:
+        Validated and sanitized codes, in input order
+    """
+    # Codes are object strings, so pandas .str methods loop in Python anyway; a plain
+    # comprehension over the ASCII translate path is several times faster
+    clean_codes = [_filter_code(_normalize_code(code, label)) for code in codes]
+
+    reference = _reference_codes(available, column)
+    if reference is not None:
+        missing = [code for code in clean_codes if code != 'All' and code not in reference]
+        if missing:
+            raise not_found(', '.join(dict.fromkeys(missing)))
+
+    return clean_codes
+
+
+def validate_route_codes(route_codes: Iterable[Union[str, int]], available_routes: ReferenceCodes = None) -> List[str]:
+    """
+    Validate a batch of route codes
+
+    Args:
+        route_codes: Route codes to validate
+        available_routes: DataFrame or validation index of available routes (optional)
+
+    Returns:
+        Validated and sanitized route codes
+
+    Raises:
+        ValidationException: If any route code is empty
+        RouteNotFoundException: If any route is not found in available routes
+    """
+    return _validate_codes(route_codes, available_routes, 'RouteCode', 'Route', RouteNotFoundException)
+
+
+def validate_customer_codes(customer_codes: Iterable[Union[str, int]], available_customers: ReferenceCodes = None) -> List[str]:
+    """
+    Validate a batch of customer codes
+
+    Args:
+        customer_codes: Customer codes to validate
+        available_customers: DataFrame or validation index of available customers (optional)
+
+    Returns:
+        Validated and sanitized customer codes
+
+    Raises:
+        ValidationException: If any customer code is empty
+        CustomerNotFoundException: If any customer is not found in available customers
+    """
+    return _validate_codes(customer_codes, available_customers, 'CustomerCode', 'Customer', CustomerNotFoundException)
+
+
+def validate_item_codes(item_codes: Iterable[Union[str, int]], available_items: ReferenceCodes = None) -> List[str]:
+    """
+    Validate a batch of item codes
+
+    Args:
+        item_codes: Item codes to validate
+        available_items: DataFrame or validation index of available items (optional)
+
+    Returns:
+        Validated and sanitized item codes
+
+    Raises:
+        ValidationException: If any item code is empty
+        ItemNotFoundException: If any item is not found in available items
+    """
+    return _validate_codes(item_codes, available_items, 'ItemCode', 'Item', ItemNotFoundException)
+
+
+def _make_code_validator(
+    available: Optional[ReferenceCodes],
+    column: str,
+    label: str,
+    not_found: Type[Exception]
+) -> Callable[[Union[str, int]], str]:
+    """
+    Build a single-code validator with the reference lookup resolved up front
+
+    Args:
+        available: Reference DataFrame or validation index (optional)
+        column: Code column in the reference DataFrame
+        label: Code name used in the empty-code error message
+        not_found: Exception raised for codes missing from the reference
+
+    Returns:
+        Callable taking a code and returning it validated and sanitized
+    """
+    reference = _reference_codes(available, column)
+
+    if reference is None:
+        def validate(code: Union[str, int]) -> str:
+            code_str = _normalize_code(code, label)
+            if code_str == 'All':
+                return 'All'
+            return _filter_code(code_str)
+
+        return validate
+
+    def validate(code: Union[str, int]) -> str:
+        code_str = _normalize_code(code, label)
+        if code_str == 'All':
+            return 'All'
+
+        clean_code = _filter_code(code_str)
+        if clean_code != 'All' and clean_code not in reference:
+            raise not_found(clean_code)
+        return clean_code
+
+    return validate
+
+
+def make_route_validator(available_routes: ReferenceCodes = None) -> Callable[[Union[str, int]], str]:
+    """
+    Create a reusable route code validator bound to the given reference data
+
+    The reference codes are resolved once, so the validator can be reused for
+    as long as the reference data does not change.
+
+    Args:
+        available_routes: DataFrame or validation index of available routes (optional)
+
+    Returns:
+        Callable behaving like validate_route_code(route_code, available_routes)
+    """
+    return _make_code_validator(available_routes, 'RouteCode', 'Route', RouteNotFoundException)
+
+
+def make_customer_validator(available_customers: ReferenceCodes = None) -> Callable[[Union[str, int]], str]:
+    """
+    Create a reusable customer code validator bound to the given reference data
+
+    Args:
+        available_customers: DataFrame or validation index of available customers (optional)
+
+    Returns:
+        Callable behaving like validate_customer_code(customer_code, available_customers)
+    """
+    return _make_code_validator(available_customers, 'CustomerCode', 'Customer', CustomerNotFoundException)
+
+
+def make_item_validator(available_items: ReferenceCodes = None) -> Callable[[Union[str, int]], str]:
+    """
+    Create a reusable item code validator bound to the given reference data
+
+    Args:
+        available_items: DataFrame or validation index of available items (optional)
+
+    Returns:
+        Callable behaving like validate_item_code(item_code, available_items)
+    """
+    return _make_code_validator(available_items, 'ItemCode', 'Item', ItemNotFoundException)
@@ -10,6 +10,59 @@ from backend.exceptions import InvalidDateFormatException, ValidationException
 from backend.constants.config_constants import DATE_FORMAT
 
 
+def _from_digits(year: str, month: str, day: str) -> Optional[datetime]:
+    """
+    Build a datetime from sliced date fields
+
+    Args:
+        year: Four-digit year field
+        month: Two-digit month field
+        day: Two-digit day field
+
+    Returns:
+        datetime object, or None if any field is not made of ASCII digits
+
+    Raises:
+        ValueError: If the fields do not form a valid date
+    """
+    digits = year + month + day
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    return datetime(int(year), int(month), int(day))
+
+
+def _parse_ten_char_date(date_string: str) -> Optional[datetime]:
+    """Parse YYYY-MM-DD, MM/DD/YYYY or DD-MM-YYYY by separator position"""
+    if date_string[4] == '-' and date_string[7] == '-':
+        return datetime.fromisoformat(date_string)
+    if date_string[2] == '/' and date_string[5] == '/':
+        return _from_digits(date_string[6:], date_string[:2], date_string[3:5])
+    if date_string[2] == '-' and date_string[5] == '-':
+        return _from_digits(date_string[6:], date_string[3:5], date_string[:2])
+    return None
+
+
+def _parse_compact_date(date_string: str) -> Optional[datetime]:
+    """Parse YYYYMMDD"""
+    return _from_digits(date_string[:4], date_string[4:6], date_string[6:])
+
+
+# Zero-padded default formats dispatched on string length, skipping strptime
+_FIXED_WIDTH_PARSERS = {
+    10: _parse_ten_char_date,
+    8: _parse_compact_date,
+}
+
+# Default formats with the separator each needs; strptime cannot match a format
+# whose literal separator is missing from the string ('' is always present)
+_DEFAULT_DATE_FORMATS = [
+    ('%Y-%m-%d', '-'),
+    ('%m/%d/%Y', '/'),
+    ('%d-%m-%Y', '-'),
+    ('%Y%m%d', ''),
+]
+
+
 def parse_date(date_string: str, formats: Optional[list] = None) -> datetime:
     """
     Parse date string with multiple format support
@@ -25,7 +78,26 @@ def parse_date(date_string: str, formats: Optional[list] = None) -> datetime:
         InvalidDateFormatException: If date cannot be parsed
     """
     if formats is None:
-        formats = ['%Y-%m-%d', '%m/%d/%Y', '%d-%m-%Y', '%Y%m%d']
+        parser = _FIXED_WIDTH_PARSERS.get(len(date_string))
+        if parser is not None:
+            try:
+                parsed = parser(date_string)
+            except ValueError:
+                parsed = None
+            if parsed is not None:
+                return parsed
+
+        # Unpadded or invalid dates: only try strptime with formats that could match
+        for fmt, separator in _DEFAULT_DATE_FORMATS:
+            if separator in date_string:
+                try:
+                    return datetime.strptime(date_string, fmt)
+                except ValueError:
+                    continue
+
+        raise InvalidDateFormatException(
+            date_string, expected_format=" or ".join(fmt for fmt, _ in _DEFAULT_DATE_FORMATS)
+        )
 
     for fmt in formats:
         try:
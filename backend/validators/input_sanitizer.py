@@ -3,8 +3,23 @@ Input sanitization utilities
 """
 
 import re
+import string
+from collections import deque
 from typing import Any, Dict, List, Union
 
+# Compiled once at import instead of looked up in the re cache on every call
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\-_.]')
+_CODE_CHARS_RE = re.compile(r'[^\w\-_]')
+
+# ASCII bytes outside _CODE_CHARS_RE's allowed set, for bytes.translate deletion
+_CODE_DELETE_BYTES = bytes(
+    c for c in range(128) if chr(c) not in string.ascii_letters + string.digits + '_-'
+)
+
+# str.translate tables deleting control characters (the first keeps newline, carriage return and tab)
+_CTRL_TABLE = {c: None for c in range(32) if chr(c) not in '\n\r\t'}
+_CTRL_TABLE_STRICT = {c: None for c in range(32)}
+
 
 def sanitize_string(value: str, max_length: int = 255, allow_special_chars: bool = False) -> str:
     """
@@ -24,12 +39,21 @@ def sanitize_string(value: str, max_length: int = 255, allow_special_chars: bool
     # Strip whitespace
     value = value.strip()
 
+    # Already clean: printable ASCII has no control characters to remove
+    if (
+        len(value) <= max_length
+        and value.isascii()
+        and value.isprintable()
+        and (allow_special_chars or _SPECIAL_CHARS_RE.search(value) is None)
+    ):
+        return value
+
     # Remove control characters
-    value = ''.join(char for char in value if ord(char) >= 32 or char in '\n\r\t')
+    value = value.translate(_CTRL_TABLE)
 
     # Remove special characters if not allowed
     if not allow_special_chars:
-        value = re.sub(r'[^\w\s\-_.]', '', value)
+        value = _SPECIAL_CHARS_RE.sub('', value)
 
     # Limit length
     if len(value) > max_length:
@@ -49,14 +73,30 @@ def sanitize_code(code: Union[str, int], alphanumeric_only: bool = True) -> str:
     Returns:
         Sanitized code string
     """
-    code_str = str(code).strip()
+    return _filter_code(str(code).strip(), alphanumeric_only)
+
+
+def _filter_code(code_str: str, alphanumeric_only: bool = True) -> str:
+    """
+    Remove disallowed characters from an already stripped code string
+
+    Args:
+        code_str: Stripped code string
+        alphanumeric_only: Only allow alphanumeric characters
 
+    Returns:
+        Sanitized code string
+    """
     if alphanumeric_only:
         # Allow only alphanumeric and common separators
-        code_str = re.sub(r'[^\w\-_]', '', code_str)
+        if code_str.isascii():
+            if not code_str.isalnum():
+                code_str = code_str.encode('ascii').translate(None, _CODE_DELETE_BYTES).decode('ascii')
+        else:
+            code_str = _CODE_CHARS_RE.sub('', code_str)
     else:
         # Remove only control characters
-        code_str = ''.join(char for char in code_str if ord(char) >= 32)
+        code_str = code_str.translate(_CTRL_TABLE_STRICT)
 
     return code_str
 
@@ -72,24 +112,43 @@ def sanitize_dict(data: Dict[str, Any], allowed_keys: List[str] = None) -> Dict[
     Returns:
         Sanitized dictionary
     """
-    if allowed_keys is not None:
-        data = {k: v for k, v in data.items() if k in allowed_keys}
+    allowed = frozenset(allowed_keys) if allowed_keys is not None else None
+    sanitize = sanitize_string
 
+    # Nested dicts are filled from a work queue instead of recursive calls; each
+    # source dict is sanitized once, which also keeps self-references finite
     sanitized = {}
-    for key, value in data.items():
-        # Sanitize key
-        clean_key = sanitize_string(key, max_length=100)
-
-        # Sanitize value based on type
-        if isinstance(value, str):
-            clean_value = sanitize_string(value, allow_special_chars=True)
-        elif isinstance(value, dict):
-            clean_value = sanitize_dict(value, allowed_keys=None)
-        elif isinstance(value, list):
-            clean_value = [sanitize_string(str(item)) if isinstance(item, str) else item for item in value]
-        else:
-            clean_value = value
-
-        sanitized[clean_key] = clean_value
+    seen = {id(data): sanitized}
+    pending = deque([(data, sanitized)])
+    while pending:
+        source, target = pending.popleft()
+        for key, value in source.items():
+            if allowed is not None and source is data and key not in allowed:
+                continue
+
+            # Exact type checks cover JSON payloads; subclasses resolve through isinstance
+            kind = type(value)
+            if kind is not str and kind is not dict and kind is not list:
+                if isinstance(value, str):
+                    kind = str
+                elif isinstance(value, dict):
+                    kind = dict
+                elif isinstance(value, list):
+                    kind = list
+
+            # Sanitize value based on type
+            if kind is str:
+                clean_value = sanitize(value, allow_special_chars=True)
+            elif kind is dict:
+                clean_value = seen.get(id(value))
+                if clean_value is None:
+                    clean_value = seen[id(value)] = {}
+                    pending.append((value, clean_value))
+            elif kind is list:
+                clean_value = [sanitize(str(item)) if isinstance(item, str) else item for item in value]
+            else:
+                clean_value = value
+
+            target[sanitize(key, max_length=100)] = clean_value
 
     return sanitized